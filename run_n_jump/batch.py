@@ -0,0 +1,101 @@
+from time import perf_counter
+
+import numpy as np
+
+import run_n_jump.logging_config as logging_config
+from .camera import Camera
+from .game import create_player
+from .grid_collision import OccupancyGrid, create_occupancy_grid
+from .kinematics import accelerate, integrate, ACCELERATION, START_SPEED
+from .labyrinth import load_labyrinth_map, LABYRINTH_SCALE
+from .systems import MOUSE_ROTATION
+
+
+class BatchSimulation:
+    """
+    Steps the players of many independent worlds that share one labyrinth in lock-step.
+    Every world is one row of the arrays, which have the same layout as a KinematicsStore.
+    Per step the players run through movement input, grid collision, acceleration and position,
+    like the camera does in the simulation of the game. Other entities are not simulated.
+    """
+
+    def __init__(self, count: int, world_collider: OccupancyGrid, camera: Camera = None, sensitivity: float = 0.5):
+        if camera is None:
+            camera = create_player()
+        self.world_collider = world_collider
+        self.sensitivity = sensitivity
+
+        self.position = np.tile(np.array(camera.position.to_list(), dtype=float), (count, 1))
+        self.rotation = np.tile(np.array(camera.rotation.to_list(), dtype=float), (count, 1))
+        self.velocity = np.zeros((count, 3))
+        self.acceleration = np.zeros((count, 3))
+        self.speed = np.full(count, float(camera.speed))
+        self.max_speed = np.full(count, float(camera.max_speed))
+        self.rows = np.arange(count)
+
+        # the collision rectangle of the player relative to its position
+        vertices = np.concatenate([box.vertex_array for box in camera.bounding_boxes]) * camera.scale
+        self.box_min = vertices.min(axis=0)
+        self.box_max = vertices.max(axis=0)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def movement_input(self, movement: np.ndarray, mouse_movement: np.ndarray):
+        """
+        Same as MovementInputSystem, movement holds the movement axes and mouse_movement the mouse delta of every world
+        """
+        scale_factor = MOUSE_ROTATION * self.sensitivity
+        self.rotation[:, 0] -= mouse_movement[:, 1] * scale_factor
+        self.rotation[:, 1] += mouse_movement[:, 0] * scale_factor
+
+        angle = np.radians(self.rotation[:, 1] + 90)
+        zeros = np.zeros(len(self))
+        forward_direction = np.stack([np.cos(angle), zeros, np.sin(angle)], axis=1)
+        sideways_direction = np.stack([-np.sin(angle), zeros, np.cos(angle)], axis=1)
+        final_direction = forward_direction * movement[:, 1:2] + sideways_direction * movement[:, 0:1]
+
+        idle = np.all(movement == 0, axis=1)
+        final_direction[~idle] /= np.linalg.norm(final_direction[~idle], axis=1)[:, np.newaxis]
+        self.acceleration = final_direction * ACCELERATION * self.speed[:, np.newaxis]
+        self.acceleration[idle] = 0
+        self.velocity[idle] = 0
+
+        starting = ~idle & np.all(self.velocity == 0, axis=1)
+        self.velocity[starting] = final_direction[starting] * START_SPEED
+
+    def collide(self) -> np.ndarray:
+        box_min = self.position + self.box_min
+        box_max = self.position + self.box_max
+        return self.world_collider.collide_all(box_min[:, 0], box_min[:, 2], box_max[:, 0], box_max[:, 2])
+
+    def step(self, frame_time: float, movement: np.ndarray, mouse_movement: np.ndarray):
+        self.movement_input(movement, mouse_movement)
+        corrections = self.collide()
+        accelerate(self, self.rows, frame_time)
+        integrate(self, self.rows, frame_time, corrections)
+
+
+def run_batch(worlds: int, ticks: int, frame_time: float = 1 / 120.0, seed: int = None) -> BatchSimulation:
+    """
+    Lets random walkers run through the labyrinth in every world, e.g. for load tests
+    """
+    log = logging_config.getLogger(__name__)
+
+    labyrinth_map = load_labyrinth_map()
+    simulation = BatchSimulation(worlds, create_occupancy_grid(labyrinth_map, LABYRINTH_SCALE))
+    random = np.random.RandomState(seed)
+
+    movement = np.zeros((worlds, 2))
+    start = perf_counter()
+    for _ in range(ticks):
+        # every walker changes its direction about once per second
+        changing = random.random_sample(worlds) < frame_time
+        movement[changing] = random.randint(-1, 2, (changing.sum(), 2))
+        mouse_movement = random.normal(0, 1, (worlds, 2))
+        simulation.step(frame_time, movement, mouse_movement)
+    duration = perf_counter() - start
+
+    steps = worlds * ticks
+    log.info(f"Ran {ticks} ticks of {worlds} worlds in {duration:.3f}s ({steps / max(duration, 1e-9):.1f} steps/s)")
+    return simulation
@@ -1,3 +1,4 @@
+from .kinematics import Kinematic
 from .math_helper import vec3, vec2, identity
 from .model import BoundingBox
 
@@ -14,7 +15,7 @@ def camera_bounding_box():
     return box
 
 
-class Camera:
+class Camera(Kinematic):
     def __init__(self, position: vec3 = vec3(), angle: vec2 = vec2()):
         self.model_matrix = identity()
         self.position = position
@@ -24,7 +25,8 @@ class Camera:
         self.acceleration = vec3()
         self.player = True
         self.speed = 1
-        self.max_speed = 0.25
+        # units per second
+        self.max_speed = 30.0
         self.bounding_boxes = [camera_bounding_box()]
         self.systems = [
             'input',
@@ -32,7 +34,9 @@ class Camera:
             'collision',
             'acceleration',
             'position',
+            'interpolation',
             'render',
+            'bbrender',
         ]
 
     def __repr__(self):
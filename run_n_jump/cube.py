@@ -8,6 +8,9 @@ from .model import ModelAsset, load_blender_file, upload, ModelInstance, add_mvp
 from .shader import Shader
 
 
+CUBE_MODEL = "models/cube.obj"
+
+
 def generate_bounding_box(vertices_in: list, normals: list):
     vertices = []
     for i in range(0, len(vertices_in), 3):
@@ -32,7 +35,7 @@ def cube_asset(color: vec3):
     ]
     asset.attributes = attributes
 
-    vertices, normals, indices, all_normals = load_blender_file("models/cube.obj")
+    vertices, normals, indices, all_normals = load_blender_file(CUBE_MODEL)
 
     asset.attribute_data = {'vertices': (3, vertices), 'normals': (3, normals)}
 
@@ -51,12 +54,15 @@ def cube_asset(color: vec3):
     return asset, vertices, all_normals
 
 
-def cube(size, position: vec3, color: vec3):
+def cube(size, position: vec3, color: vec3, render: bool = True):
     model = ModelInstance()
     model.name = "Cube" + str(position)
-    asset, vertices, normals = cube_asset(color)
+    if render:
+        asset, vertices, normals = cube_asset(color)
+        model.asset = asset
+    else:
+        vertices, _, _, normals = load_blender_file(CUBE_MODEL)
 
-    model.asset = asset
     model.bounding_boxes = [generate_bounding_box(vertices, normals)]
     model.scale = size
     model.position = position
@@ -65,6 +71,7 @@ def cube(size, position: vec3, color: vec3):
 
     model.systems = [
         'position',
-        'render'
+        'render',
+        'bbrender'
     ]
     return model
@@ -0,0 +1,79 @@
+from ctypes import c_float, sizeof
+
+from pyglet.gl import GL_FLOAT, GL_LINES
+
+from .math_helper import vec3, identity, scale, translate
+from .model import ModelAsset, ModelInstance, IndexBuffer, upload, add_mvp_uniforms
+from .shader import Shader
+
+# pairs of corner indices, corners are numbered by their x, y and z bit
+BOX_EDGES = [
+    (0, 1), (2, 3), (4, 5), (6, 7),
+    (0, 2), (1, 3), (4, 6), (5, 7),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+]
+
+
+def box_corners(box) -> list:
+    minimum = box.vertex_array.min(axis=0)
+    maximum = box.vertex_array.max(axis=0)
+    corners = []
+    for index in range(8):
+        x = maximum[0] if index & 4 else minimum[0]
+        y = maximum[1] if index & 2 else minimum[1]
+        z = maximum[2] if index & 1 else minimum[2]
+        corners.append(vec3(float(x), float(y), float(z)) + box.position)
+    return corners
+
+
+def bounding_box_lines(bounding_boxes: list):
+    """
+    Batches the outlines of all boxes into one line list
+    """
+    vertices = []
+    indices = []
+    for box in bounding_boxes:
+        offset = len(vertices) // 3
+        for corner in box_corners(box):
+            vertices.extend(corner.to_list())
+        for start, end in BOX_EDGES:
+            indices.extend([offset + start, offset + end])
+    return vertices, indices
+
+
+def bounding_box_model(entity, shader: Shader) -> ModelInstance:
+    asset = ModelAsset()
+    asset.color = vec3(1, 0, 1)
+    asset.shader = shader
+    asset.attributes = [
+        (0, 'a_Position', GL_FLOAT, 3, 3 * sizeof(c_float), 0)
+    ]
+
+    vertices, indices = bounding_box_lines(entity.bounding_boxes)
+    asset.attribute_data = {'vertices': (3, vertices)}
+
+    index_buffer = IndexBuffer()
+    index_buffer.draw_type = GL_LINES
+    index_buffer.draw_count = len(indices)
+    index_buffer.indices = indices
+    asset.index_buffers.append(index_buffer)
+
+    upload(asset)
+
+    add_mvp_uniforms(asset.uniforms)
+    asset.uniforms["u_Color"] = "color"
+
+    model = ModelInstance()
+    model.asset = asset
+    model.name = f"BoundingBoxes({entity})"
+    return model
+
+
+def update_bounding_box_model(model: ModelInstance, entity):
+    """
+    Bounding boxes are placed like their entity, but without its rotation
+    """
+    model.model_matrix = identity()
+    if hasattr(entity, 'scale'):
+        scale(model.model_matrix, entity.scale)
+    translate(model.model_matrix, entity.position)
@@ -7,9 +7,16 @@ def create_debug_ui(system_names):
     total_time = text2d("Total time={total_time:.3f}ms", position=vec2(0, 0), font_size=9)
     result.append(total_time)
 
-    # for index, system_name in enumerate(system_names):
-    #     system_time = text2d(system_name + "={" + system_name + ":.3f}ms", position=vec2(100, 90 + index * 10),
-    #                          font_size=11)
-    #     result.append(system_time)
+    frame_time = text2d("Frame: p50={frame_p50:.2f}ms p95={frame_p95:.2f}ms p99={frame_p99:.2f}ms"
+                        " max={frame_max:.2f}ms variance={frame_variance:.3f} hitches={frame_hitches}",
+                        position=vec2(0, 15), font_size=9)
+    result.append(frame_time)
+
+    for index, system_name in enumerate(system_names):
+        text = system_name + ": n={" + system_name + "_count} total={" + system_name + "_total:.3f}ms" + \
+               " min={" + system_name + "_min:.3f}ms max={" + system_name + "_max:.3f}ms" + \
+               " p95={" + system_name + "_p95:.3f}ms"
+        system_time = text2d(text, position=vec2(0, 30 + index * 15), font_size=9)
+        result.append(system_time)
 
     return result
@@ -0,0 +1,94 @@
+import heapq
+import itertools
+from time import perf_counter
+
+from .game_data import GameData
+from .tracing import tracer
+
+
+class Task:
+    """
+    Deferred main-thread work. The function gets the game data and returns True while it has work left.
+    A task runs again after interval frames at the earliest, with an interval of 0 it can run several times per frame.
+    Once max_delay frames have passed since it was added or last ran, it runs even when there is no time left.
+    Tasks with lower priority values run first. If ready is given, the task only runs while ready() returns True.
+    """
+
+    def __init__(self, name: str, function, priority: int = 0, interval: int = 0, max_delay: int = None,
+                 ready=None):
+        self.name = name
+        self.function = function
+        self.priority = priority
+        self.interval = interval
+        self.max_delay = max_delay
+        self.ready = ready
+
+        self.next_frame = 0
+        self.deadline = None
+
+    def schedule(self, frame: int):
+        self.next_frame = frame
+        self.deadline = frame + self.max_delay if self.max_delay is not None else None
+
+    def can_run(self, frame: int) -> bool:
+        return self.next_frame <= frame and (self.ready is None or self.ready())
+
+    def overdue(self, frame: int) -> bool:
+        return self.deadline is not None and self.deadline <= frame
+
+    def __str__(self):
+        return f"Task[{self.name}]"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class DeferredTasks:
+    """
+    Runs tasks on the main thread within a time budget per frame.
+    Overdue tasks always run first, the remaining ready tasks run by priority until the budget is used up.
+    """
+
+    def __init__(self):
+        self.tasks = []
+        self.order = itertools.count()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def add(self, task: Task, frame: int = 0):
+        task.schedule(frame)
+        self.tasks.append(task)
+
+    def run(self, game_data: GameData, frame: int, budget: float = None) -> int:
+        """
+        Runs ready tasks for at most budget seconds, without a budget all ready tasks run.
+        Returns the number of task runs.
+        """
+        start = perf_counter()
+        ready = []
+        for task in self.tasks:
+            if task.can_run(frame):
+                heapq.heappush(ready, (not task.overdue(frame), task.priority, next(self.order), task))
+
+        runs = 0
+        while len(ready) > 0:
+            not_overdue, _, _, task = ready[0]
+            if not_overdue and budget is not None and perf_counter() - start >= budget:
+                break
+            heapq.heappop(ready)
+
+            with tracer.span(task.name):
+                more = task.function(game_data)
+            runs += 1
+
+            if not more:
+                self.tasks.remove(task)
+                continue
+
+            task.schedule(frame + task.interval)
+            if task.can_run(frame):
+                heapq.heappush(ready, (True, task.priority, next(self.order), task))
+
+        tracer.counter("DeferredTaskRuns", runs)
+        return runs
@@ -0,0 +1,100 @@
+from time import perf_counter_ns
+
+import numpy as np
+
+NS_PER_MS = 1000000
+
+
+class FrameStatistics:
+    """
+    Rolling statistics over the durations of the last window_size frames.
+    Durations are kept in a ring buffer and a histogram with bins of bin_width_ms,
+    longer frames than max_ms all go into the last bin. Percentiles are read from the histogram,
+    so they are accurate to one bin width. A hitch is a frame that takes hitch_factor times the median or longer.
+    """
+
+    def __init__(self, window_size: int = 1000, bin_width_ms: float = 0.25, max_ms: float = 100.0,
+                 hitch_factor: float = 2.0):
+        self.window_size = window_size
+        self.bin_width = int(bin_width_ms * NS_PER_MS)
+        self.hitch_factor = hitch_factor
+
+        self.durations = np.zeros(window_size, dtype=np.int64)
+        self.histogram = np.zeros(int(max_ms * NS_PER_MS) // self.bin_width + 1, dtype=np.int64)
+        self.count = 0
+        self.last_timestamp = None
+
+    def __len__(self):
+        return min(self.count, self.window_size)
+
+    def frame(self):
+        """
+        Marks the start of a frame, the time since the previous call is the duration of the last frame
+        """
+        timestamp = perf_counter_ns()
+        if self.last_timestamp is not None:
+            self.add(timestamp - self.last_timestamp)
+        self.last_timestamp = timestamp
+
+    def bin(self, duration_ns: int) -> int:
+        return min(duration_ns // self.bin_width, len(self.histogram) - 1)
+
+    def add(self, duration_ns: int):
+        position = self.count % self.window_size
+        if self.count >= self.window_size:
+            self.histogram[self.bin(int(self.durations[position]))] -= 1
+        self.durations[position] = duration_ns
+        self.histogram[self.bin(duration_ns)] += 1
+        self.count += 1
+
+    def window(self) -> np.ndarray:
+        """
+        Frame durations in ns, oldest first
+        """
+        if self.count <= self.window_size:
+            return self.durations[:self.count]
+        position = self.count % self.window_size
+        return np.concatenate([self.durations[position:], self.durations[:position]])
+
+    def percentile(self, percent: float) -> float:
+        """
+        Upper edge of the bin that contains the percentile, in ms
+        """
+        if len(self) == 0:
+            return 0.0
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, percent / 100 * len(self)))
+        return (index + 1) * self.bin_width / NS_PER_MS
+
+    def summary(self) -> dict:
+        """
+        Returns p50, p95, p99, max, mean and variance of the frame times in ms, and the number of hitches
+        """
+        if len(self) == 0:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0, 'mean': 0.0, 'variance': 0.0, 'hitches': 0}
+
+        durations = self.window() / NS_PER_MS
+        maximum = float(durations.max())
+        # the upper edge of the last bin can lie above the longest frame
+        p50 = min(self.percentile(50), maximum)
+        return {
+            'p50': p50,
+            'p95': min(self.percentile(95), maximum),
+            'p99': min(self.percentile(99), maximum),
+            'max': maximum,
+            'mean': float(durations.mean()),
+            'variance': float(durations.var()),
+            'hitches': int(np.count_nonzero(durations >= self.hitch_factor * p50)),
+        }
+
+    def publish(self, debug_data: dict):
+        summary = self.summary()
+        for key in summary:
+            debug_data[f"frame_{key}"] = summary[key]
+
+    def export_csv(self, filename: str):
+        with open(filename, "w") as f:
+            f.write("frame,frame_time_ms\n")
+            first_frame = self.count - len(self)
+            for index, duration in enumerate(self.window().tolist()):
+                f.write(f"{first_frame + index},{duration / NS_PER_MS}\n")
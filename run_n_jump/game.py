@@ -1,104 +1,203 @@
-import logging
+import functools
 import random
+from time import perf_counter
 
 import pyglet
 
 import run_n_jump.logging_config as logging_config
 from .camera import Camera
 from .debug_ui import create_debug_ui
+from .deferred import DeferredTasks, Task
 from .game_data import GameData
 from .helper import Timer
-from .labyrinth import labyrinth, create_labyrinth
+from .jobs import JobSystem
+from .kinematics import KinematicsStore
+from .grid_collision import create_occupancy_grid
+from .labyrinth import LabyrinthLoader, create_labyrinth, generate_block, BLOCK_SIZE, load_labyrinth_map, LABYRINTH_SCALE
 from .math_helper import vec2, vec3, identity, rotate, translate
+from .pool import ContactBuffer
 from .quad_tree import build_quad_tree
+from .registry import EntityRegistry
+from .scheduler import Scheduler
+from .tracing import tracer
 from .systems import RenderSystem, PositionSystem, InputSystem, MovementInputSystem, AccelerationSystem, \
-    BoundingBoxRenderSystem, GlobalInputSystem, DebugUISystem, CollisionSystem
+    BoundingBoxRenderSystem, GlobalInputSystem, DebugUISystem, CollisionSystem, InterpolationSystem
 from .cube import cube
 
 
+SIMULATION_ORDER = [
+    "input",
+    "movement_input",
+    "collision",
+    "acceleration",
+    "position",
+]
+
+RENDER_ORDER = [
+    "interpolation",
+    "render",
+    "bbrender",
+]
+
+HEADLESS_RENDER_ORDER = [
+    "interpolation",
+]
+
+# upper bound of simulation steps per frame, so a long frame does not cause even longer frames
+MAX_SIMULATION_STEPS = 5
+
+
 class Game:
-    def __init__(self):
+    def __init__(self, grid_collision: bool = False, simulation_rate: int = 120, headless: bool = False,
+                 seed: int = None, workers: int = 0, frame_target: float = None, loader_processes: int = 0,
+                 collision_workers: int = 0, load_labyrinth: bool = True):
         self.log = logging_config.getLogger(__name__)
-        self.log.setLevel(logging.INFO)
 
-        camera_position = vec3(30, 0, 15)
-        camera_angle = vec2(0, -90)
-        self.camera = Camera(camera_position, camera_angle)
+        # without a GL context no assets are created and nothing is rendered
+        self.headless = headless
+        # all randomness goes through this generator, so runs with the same seed are reproducible
+        self.random = random.Random(seed)
+
+        self.camera = create_player()
 
         self.frame_counter = -1
 
+        self.simulation_step = 1 / simulation_rate
+        self.accumulated_time = 0.0
+        self.mouse_movement = vec2()
+
         self.light_position = vec3(50, 0, 50)
         self.light_direction = vec3(0, -1, 0)
 
-        self.entities = [
-            self.camera,
-        ]
-
-        for i in range(1, 5):
-            entity = cube(1, vec3(i*10, 0, i*10), vec3(1, 0, 1))
-            self.entities.append(entity)
-
-        self.labyrinth_generator = labyrinth()
-
+        # deferred tasks get the time that is left of frame_target seconds per frame, without a target all of them run
+        self.frame_target = frame_target
+        self.deferred = DeferredTasks()
+
+        labyrinth_map = load_labyrinth_map()
+        self.labyrinth_map = labyrinth_map
+        # offsets of the labyrinth blocks that were loaded in the current tick
+        self.loaded_blocks = []
+        # without load_labyrinth, blocks are only loaded through load_labyrinth_blocks, e.g. by replays
+        self.labyrinth_loader = None
+        if load_labyrinth:
+            # headless games generate blocks on demand, so the loaded labyrinth does not depend on timing
+            if headless:
+                self.labyrinth_loader = LabyrinthLoader(labyrinth_map, background=False)
+            else:
+                self.labyrinth_loader = LabyrinthLoader(labyrinth_map, processes=loader_processes,
+                                                        progress=self.log_loading_progress)
+            self.deferred.add(Task("LoadLabyrinth", self.load_labyrinth_block, max_delay=20,
+                                   ready=self.labyrinth_loader.ready))
+
+        world_collider = None
+        if grid_collision:
+            world_collider = create_occupancy_grid(labyrinth_map, LABYRINTH_SCALE)
+
+        self.kinematics = KinematicsStore()
         self.systems = {
             "input": InputSystem(),
             "movement_input": MovementInputSystem(),
-            "collision": CollisionSystem(),
-            "acceleration": AccelerationSystem(),
-            "position": PositionSystem(),
+            "collision": CollisionSystem(collision_workers, world_collider),
+            "acceleration": AccelerationSystem(self.kinematics),
+            "position": PositionSystem(self.kinematics),
+            "interpolation": InterpolationSystem(),
             "render": RenderSystem(),
             "bbrender": BoundingBoxRenderSystem(),
             "debug_ui": DebugUISystem(),
             "global_input": GlobalInputSystem()
         }
 
-        self.ui_elements = [
-            *create_debug_ui(map(lambda s: s.name, self.systems.values())),
-        ]
+        self.jobs = JobSystem(workers)
+        self.contacts = ContactBuffer()
+        self.registry = EntityRegistry(self.systems, self.contacts)
+        self.simulation_scheduler = Scheduler(self.systems, self.registry, SIMULATION_ORDER, self.jobs)
+        if headless:
+            self.render_scheduler = Scheduler(self.systems, self.registry, HEADLESS_RENDER_ORDER, self.jobs)
+        else:
+            self.render_scheduler = Scheduler(self.systems, self.registry, RENDER_ORDER, self.jobs)
+        self.registry.add(self.camera)
+
+        for i in range(1, 5):
+            entity = cube(1, vec3(i*10, 0, i*10), vec3(1, 0, 1), render=not headless)
+            self.registry.add(entity)
+
+        self.ui_elements = []
+        if not headless:
+            self.ui_elements.extend(create_debug_ui(map(lambda s: s.name, self.systems.values())))
+        for element in self.ui_elements:
+            self.deferred.add(Task("RefreshDebugUI", functools.partial(self.refresh_debug_ui, element), priority=1,
+                                   interval=1, max_delay=len(self.ui_elements)))
+
+    def close(self):
+        """
+        Stops the worker threads and processes of the game
+        """
+        self.jobs.shutdown()
+        self.systems['collision'].shutdown()
+        if self.labyrinth_loader is not None:
+            self.labyrinth_loader.close()
 
     def tick(self, game_data: GameData):
+        tracer.begin("Frame")
+        start = perf_counter()
         self.frame_counter += 1
-        self.finish_loading_labyrinth()
+        self.loaded_blocks = []
 
-        game_data.entities = build_quad_tree(self.entities)
+        game_data.entities = build_quad_tree(self.registry.entities)
         game_data.systems = self.systems
+        game_data.contacts = self.contacts
         game_data.camera = self.camera
         if not game_data.show_overview:
             game_data.player_configuration = (
                 self.camera.position, self.camera.rotation)
 
-        view_matrix = identity()
-        translate(view_matrix, self.camera.position * -1)
-        rotate(view_matrix, self.camera.rotation)
-        game_data.view_matrix = view_matrix
-
-        game_data.lights = place_lights(game_data.lights)
-        if len(game_data.lights) < 5:
-            game_data.lights.append(
-                {'position': self.camera.position, 'color': vec3(1, 1, 1), 'power': 100.0})
-        game_data.number_of_lights = len(game_data.lights)
         game_data.light_direction = self.light_direction
 
         self.run_systems(game_data)
 
-        for index, element in enumerate(self.ui_elements):
-            if self.frame_counter % len(self.ui_elements) - index == 0:
-                self.systems['debug_ui'].run(game_data, element)
-            self.systems['position'].run(game_data, element)
-            self.systems['render'].run(game_data, element)
-
-    def finish_loading_labyrinth(self):
-        if self.frame_counter % 20 == 0 and self.labyrinth_generator is not None:
-            try:
-                lab_params = self.labyrinth_generator.__next__()
-                if lab_params is not None:
-                    self.entities.append(create_labyrinth(*lab_params))
-            except StopIteration:
-                self.log.info("Done loading labyrinth")
-                self.labyrinth_generator = None
+        for element in self.ui_elements:
+            self.systems['position'].run_all(game_data, [element])
+            self.systems['render'].run_all(game_data, [element])
+
+        budget = None
+        if self.frame_target is not None:
+            budget = max(0.0, self.frame_target - (perf_counter() - start))
+        self.deferred.run(game_data, self.frame_counter, budget)
+        tracer.end("Frame")
+
+    def load_labyrinth_block(self, game_data: GameData) -> bool:
+        try:
+            lab_params = self.labyrinth_loader.next_block()
+        except StopIteration:
+            self.log.info("Done loading labyrinth")
+            self.labyrinth_loader = None
+            return False
+
+        if lab_params is not None:
+            self.registry.add(create_labyrinth(*lab_params, render=not self.headless))
+            self.loaded_blocks.append(lab_params[:2])
+        return True
+
+    def load_labyrinth_blocks(self, offsets: list):
+        """
+        Generates and loads the blocks at the given (row, col) offsets right away
+        """
+        for row, col in offsets:
+            block = self.labyrinth_map[row:row + BLOCK_SIZE, col:col + BLOCK_SIZE]
+            lab_params = generate_block(block, row, col, BLOCK_SIZE)
+            if lab_params is not None:
+                self.registry.add(create_labyrinth(*lab_params, render=not self.headless))
+            self.loaded_blocks.append((row, col))
+
+    def log_loading_progress(self, done: int, total: int):
+        self.log.debug(f"Generated {done}/{total} labyrinth blocks")
+
+    def refresh_debug_ui(self, element, game_data: GameData) -> bool:
+        self.systems['debug_ui'].run_all(game_data, [element])
+        return True
 
     def run_systems(self, game_data):
-        self.systems['global_input'].run(game_data, None)
+        self.systems['global_input'].run_all(game_data, [None])
 
         with Timer(self.log, "MainLoop") as main_timer:
             query_positions = self.get_query_positions(game_data)
@@ -106,22 +205,51 @@ class Game:
             for position in query_positions:
                 entities.extend(game_data.entities.query(position))
 
-            self.log.debug(f"{len(entities)} entities")
-            for entity in entities:
-                for system_name in entity.systems:
-                    if system_name not in self.systems:
-                        continue
+            tracer.counter("Entities", len(entities))
+            self.simulate(game_data, entities)
+
+            view_matrix = identity()
+            translate(view_matrix, InterpolationSystem.interpolated_position(game_data, self.camera) * -1)
+            rotate(view_matrix, self.camera.rotation)
+            game_data.view_matrix = view_matrix
 
-                    system = self.systems[system_name]
-                    if system.supports(entity):
-                        self.log.debug(
-                            f"Running system {system} on entity {entity}")
-                        system.run(game_data, entity)
+            self.render_scheduler.run(game_data, entities)
 
             for system in self.systems.values():
                 system.reset(game_data)
 
         game_data.debug_data["total_time"] = main_timer.time_diff
+        for system in self.systems.values():
+            system.publish_timings(game_data)
+
+    def simulate(self, game_data: GameData, entities: list):
+        """
+        Advances the simulation in fixed steps and leaves the remaining time for interpolation
+        """
+        frame_time = game_data.frame_time
+        self.accumulated_time = min(self.accumulated_time + frame_time,
+                                    MAX_SIMULATION_STEPS * self.simulation_step)
+        # mouse movement is collected until the next simulation step consumes it
+        self.mouse_movement += game_data.mouse_movement
+
+        game_data.frame_time = self.simulation_step
+        while self.accumulated_time >= self.simulation_step:
+            game_data.mouse_movement = self.mouse_movement
+            self.mouse_movement = vec2()
+
+            tracer.begin("SimulationStep")
+            game_data.lights = place_lights(game_data.lights, self.random)
+            if len(game_data.lights) < 5:
+                game_data.lights.append(
+                    {'position': self.camera.position, 'color': vec3(1, 1, 1), 'power': 100.0})
+            game_data.number_of_lights = len(game_data.lights)
+
+            self.simulation_scheduler.run(game_data, entities)
+            self.accumulated_time -= self.simulation_step
+            tracer.end("SimulationStep")
+
+        game_data.frame_time = frame_time
+        game_data.interpolation = self.accumulated_time / self.simulation_step
 
     def get_query_positions(self, game_data: GameData):
         if not game_data.show_overview:
@@ -146,21 +274,25 @@ class Game:
             self.log.debug(f"Key event: {symbol} {modifiers} {pressed}")
 
 
-def place_lights(current_lights: list):
+def create_player() -> Camera:
+    return Camera(vec3(30, 0, 15), vec2(0, -90))
+
+
+def place_lights(current_lights: list, rng: random.Random = random):
     if len(current_lights) == 0:
         return [{
             'position': vec3(0, 0, 0),
-            'color': vec3(random.random(), random.random(), random.random()),
-            'power': random.uniform(1.0, 50.0)
+            'color': vec3(rng.random(), rng.random(), rng.random()),
+            'power': rng.uniform(1.0, 50.0)
         } for _ in range(10)]
-    current_lights = list(map(move_light, current_lights))
+    current_lights = [move_light(light, rng) for light in current_lights]
     return current_lights
 
 
-def move_light(light: dict):
-    x = random.random() - 0.4
-    z = random.random() - 0.4
-    if random.random() < 0.6:
+def move_light(light: dict, rng: random.Random = random):
+    x = rng.random() - 0.4
+    z = rng.random() - 0.4
+    if rng.random() < 0.6:
         direction = 1
     else:
         direction = -1
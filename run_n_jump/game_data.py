@@ -1,34 +1,60 @@
 from .camera import Camera
 from .math_helper import identity, vec3, vec2
+from .pool import ContactBuffer
 from .quad_tree import QuadTree
 
 
 class GameData:
-    frame_time = 0.0
-
-    key_map = {}
-    mouse_position = vec2()
-    mouse_movement = vec2()
-
-    screen_dimensions = vec2()
-
-    model_matrix = identity()
-    view_matrix = identity()
-    projection_matrix = identity()
-
-    lights = []
-    light_direction = vec3()
-
-    sensitivity = 0.5
-
-    entities: QuadTree = None
-    systems = {}
-
-    show_overview = False
-    wireframe = False
-    collision_boxes = False
-
-    camera: Camera = None
-    player_configuration = ()
-
-    debug_data = {}
+    """
+    Per-frame state of one world, every world needs its own instance
+    """
+
+    __slots__ = [
+        'frame_time', 'interpolation',
+        'actions', 'triggered_actions', 'movement', 'mouse_position', 'mouse_movement',
+        'screen_dimensions',
+        'model_matrix', 'view_matrix', 'projection_matrix',
+        'lights', 'number_of_lights', 'light_direction',
+        'sensitivity',
+        'entities', 'systems', 'contacts',
+        'show_overview', 'wireframe', 'collision_boxes',
+        'camera', 'player_configuration',
+        'debug_data',
+    ]
+
+    def __init__(self, screen_dimensions: vec2 = None, sensitivity: float = 0.5):
+        self.frame_time = 0.0
+        # fraction of a simulation step that has passed since the last simulated state
+        self.interpolation = 1.0
+
+        # names of the actions that are active in this tick and of those that were pressed since the last tick
+        self.actions = frozenset()
+        self.triggered_actions = frozenset()
+        self.movement = vec2()
+        self.mouse_position = vec2()
+        self.mouse_movement = vec2()
+
+        self.screen_dimensions = screen_dimensions if screen_dimensions is not None else vec2()
+
+        self.model_matrix = identity()
+        self.view_matrix = identity()
+        self.projection_matrix = identity()
+
+        self.lights = []
+        self.number_of_lights = 0
+        self.light_direction = vec3()
+
+        self.sensitivity = sensitivity
+
+        self.entities: QuadTree = None
+        self.systems = {}
+        self.contacts: ContactBuffer = None
+
+        self.show_overview = False
+        self.wireframe = False
+        self.collision_boxes = False
+
+        self.camera: Camera = None
+        self.player_configuration = ()
+
+        self.debug_data = {}
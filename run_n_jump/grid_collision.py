@@ -0,0 +1,122 @@
+import math
+
+import numpy as np
+
+from .math_helper import vec3
+
+WALKABLE = 255
+
+
+class OccupancyGrid:
+    """
+    Collider for maps that consist of square cells.
+    Cell (row, col) covers x in [col * cell_size, (col + 1) * cell_size] and z in [row * cell_size, (row + 1) * cell_size].
+    Everything outside of the grid is solid.
+    """
+
+    def __init__(self, solid: np.ndarray, cell_size: float):
+        self.solid = solid
+        self.cell_size = cell_size
+
+    def __str__(self):
+        return f"OccupancyGrid[{self.solid.shape[0]}x{self.solid.shape[1]}, cell_size={self.cell_size}]"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def is_solid(self, row: int, col: int) -> bool:
+        if row < 0 or col < 0 or row >= self.solid.shape[0] or col >= self.solid.shape[1]:
+            return True
+        return bool(self.solid[row, col])
+
+    def cell_range(self, start: float, end: float):
+        return range(math.floor(start / self.cell_size), math.ceil(end / self.cell_size))
+
+    def collide(self, min_x: float, min_z: float, max_x: float, max_z: float) -> list:
+        """
+        Returns one translation for every solid cell the rectangle overlaps.
+        Only pushes towards free neighbor cells are considered, so the rectangle never gets caught
+        on the seam between two adjacent solid cells.
+        """
+        contacts = []
+        for row in self.cell_range(min_z, max_z):
+            for col in self.cell_range(min_x, max_x):
+                if not self.is_solid(row, col):
+                    continue
+
+                cell_min_x = col * self.cell_size
+                cell_min_z = row * self.cell_size
+                candidates = []
+                if not self.is_solid(row, col - 1):
+                    candidates.append(vec3(cell_min_x - max_x, 0, 0))
+                if not self.is_solid(row, col + 1):
+                    candidates.append(vec3(cell_min_x + self.cell_size - min_x, 0, 0))
+                if not self.is_solid(row - 1, col):
+                    candidates.append(vec3(0, 0, cell_min_z - max_z))
+                if not self.is_solid(row + 1, col):
+                    candidates.append(vec3(0, 0, cell_min_z + self.cell_size - min_z))
+
+                if len(candidates) > 0:
+                    contacts.append(min(candidates, key=lambda c: abs(c.x) + abs(c.z)))
+        return contacts
+
+    def solid_cells(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        inside = (rows >= 0) & (cols >= 0) & (rows < self.solid.shape[0]) & (cols < self.solid.shape[1])
+        result = np.ones(rows.shape, dtype=bool)
+        result[inside] = self.solid[rows[inside], cols[inside]]
+        return result
+
+    def collide_all(self, min_x: np.ndarray, min_z: np.ndarray, max_x: np.ndarray, max_z: np.ndarray) -> np.ndarray:
+        """
+        Collides many rectangles at once and returns one correction per rectangle.
+        The result is the same as resolving the contacts of collide for every rectangle.
+        """
+        if len(min_x) == 0:
+            return np.zeros((0, 3))
+
+        first_rows = np.floor(min_z / self.cell_size).astype(np.intp)
+        end_rows = np.ceil(max_z / self.cell_size).astype(np.intp)
+        first_cols = np.floor(min_x / self.cell_size).astype(np.intp)
+        end_cols = np.ceil(max_x / self.cell_size).astype(np.intp)
+
+        positive = np.zeros((len(min_x), 2))
+        negative = np.zeros((len(min_x), 2))
+        for row_offset in range(int((end_rows - first_rows).max())):
+            for col_offset in range(int((end_cols - first_cols).max())):
+                rows = first_rows + row_offset
+                cols = first_cols + col_offset
+                overlaps = (rows < end_rows) & (cols < end_cols) & self.solid_cells(rows, cols)
+
+                cell_min_x = cols * self.cell_size
+                cell_min_z = rows * self.cell_size
+                # pushes along x and z towards the free neighbors, in the same order as in collide
+                pushes = np.stack([
+                    cell_min_x - max_x,
+                    cell_min_x + self.cell_size - min_x,
+                    cell_min_z - max_z,
+                    cell_min_z + self.cell_size - min_z,
+                ], axis=1)
+                free = np.stack([
+                    ~self.solid_cells(rows, cols - 1),
+                    ~self.solid_cells(rows, cols + 1),
+                    ~self.solid_cells(rows - 1, cols),
+                    ~self.solid_cells(rows + 1, cols),
+                ], axis=1)
+
+                # argmin returns the first of equal candidates, like min in collide
+                costs = np.where(free, np.abs(pushes), np.inf)
+                choice = np.argmin(costs, axis=1)
+                contact = (overlaps & free.any(axis=1))[:, np.newaxis]
+                push = np.where(contact, pushes[np.arange(len(choice)), choice][:, np.newaxis], 0)
+                on_z = (choice >= 2)[:, np.newaxis]
+                pushes_xz = np.concatenate([np.where(on_z, 0, push), np.where(on_z, push, 0)], axis=1)
+
+                positive = np.maximum(positive, pushes_xz)
+                negative = np.minimum(negative, pushes_xz)
+
+        corrections = positive + negative
+        return np.stack([corrections[:, 0], np.zeros(len(min_x)), corrections[:, 1]], axis=1)
+
+
+def create_occupancy_grid(image_array: np.ndarray, cell_size: float) -> OccupancyGrid:
+    return OccupancyGrid(image_array != WALKABLE, cell_size)
@@ -0,0 +1,46 @@
+from time import perf_counter
+
+import run_n_jump.logging_config as logging_config
+from .frame_statistics import FrameStatistics
+from .game import Game
+from .game_data import GameData
+from .math_helper import vec2
+from .recording import load_recording, idle_recording, records_labyrinth, replay
+
+
+def run_headless(ticks: int, frame_time: float = 1 / 120.0, grid_collision: bool = False, seed: int = None,
+                 recording_file: str = None, workers: int = 0, frame_statistics: str = None,
+                 collision_workers: int = 0) -> GameData:
+    """
+    Runs the simulation without a window or GL context as fast as possible.
+    Every tick pretends that frame_time seconds have passed, so runs are comparable across machines.
+    With a recording the recorded input, frame times, seed, grid collision and loaded labyrinth blocks are used instead.
+    """
+    log = logging_config.getLogger(__name__)
+
+    if recording_file is not None:
+        recording = load_recording(recording_file)
+    else:
+        recording = idle_recording(ticks, frame_time, seed, grid_collision)
+    ticks = len(recording['frames'])
+
+    game = Game(grid_collision=recording.get('grid_collision', grid_collision), headless=True,
+                seed=recording['seed'], workers=workers, collision_workers=collision_workers,
+                load_labyrinth=not records_labyrinth(recording))
+    game_data = GameData(screen_dimensions=vec2(1280, 720))
+
+    statistics = FrameStatistics(window_size=max(ticks, 1))
+    start = perf_counter()
+    replay(game, game_data, recording, statistics.frame)
+    statistics.frame()
+    duration = perf_counter() - start
+    game.close()
+
+    summary = statistics.summary()
+    log.info(f"Ran {ticks} ticks in {duration:.3f}s ({ticks / max(duration, 1e-9):.1f} ticks/s), "
+             f"{len(game.registry)} entities, camera at {game.camera.position}")
+    log.info(f"Tick time p50={summary['p50']:.2f}ms p95={summary['p95']:.2f}ms p99={summary['p99']:.2f}ms "
+             f"max={summary['max']:.2f}ms hitches={summary['hitches']}")
+    if frame_statistics is not None:
+        statistics.export_csv(frame_statistics)
+    return game_data
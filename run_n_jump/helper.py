@@ -1,3 +1,4 @@
+import math
 from datetime import datetime
 from logging import Logger
 
@@ -16,3 +17,35 @@ class Timer:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.time_diff = (datetime.now() - self.start).total_seconds() * 1000
         self.log.debug(f"{self.time_diff} ms for '{self.text}'")
+
+
+class CallTimings:
+    """
+    Collects the durations of individual calls over one frame
+    """
+
+    def __init__(self):
+        self.durations = []
+
+    def add(self, duration: float):
+        self.durations.append(duration)
+
+    def clear(self):
+        self.durations = []
+
+    def summary(self) -> dict:
+        """
+        Returns count, total, min, max and p95 of the collected durations, all times in ms
+        """
+        if len(self.durations) == 0:
+            return {'count': 0, 'total': 0.0, 'min': 0.0, 'max': 0.0, 'p95': 0.0}
+
+        durations = sorted(self.durations)
+        p95_index = math.ceil(0.95 * len(durations)) - 1
+        return {
+            'count': len(durations),
+            'total': sum(durations) * 1000,
+            'min': durations[0] * 1000,
+            'max': durations[-1] * 1000,
+            'p95': durations[p95_index] * 1000,
+        }
@@ -0,0 +1,67 @@
+import pyglet
+
+from .game_data import GameData
+from .math_helper import vec2
+
+DEFAULT_BINDINGS = {
+    pyglet.window.key.W: 'move_forward',
+    pyglet.window.key.S: 'move_backward',
+    pyglet.window.key.A: 'move_left',
+    pyglet.window.key.D: 'move_right',
+    pyglet.window.key.SPACE: 'toggle_wireframe',
+    pyglet.window.key.O: 'toggle_overview',
+    pyglet.window.key.B: 'toggle_collision_boxes',
+    pyglet.window.key.F12: 'dump_trace',
+}
+
+
+def movement_axes(actions) -> vec2:
+    """
+    x is positive to the left and y is positive backwards, opposite keys cancel each other out
+    """
+    return vec2(
+        int('move_left' in actions) - int('move_right' in actions),
+        int('move_backward' in actions) - int('move_forward' in actions)
+    )
+
+
+class InputState:
+    """
+    Collects the key and mouse events of the window and turns them into actions once per tick.
+    Actions that were pressed and released within one tick still count as active for that tick,
+    and the mouse movement of all motion events is added up, so no event gets lost.
+    """
+
+    def __init__(self, bindings: dict = None):
+        if bindings is None:
+            bindings = DEFAULT_BINDINGS
+        self.bindings = bindings
+
+        self.held_actions = set()
+        self.pressed_actions = set()
+        self.mouse_position = vec2()
+        self.mouse_movement = vec2()
+
+    def key_event(self, symbol: int, pressed: bool):
+        action = self.bindings.get(symbol)
+        if action is None:
+            return
+        if pressed:
+            self.held_actions.add(action)
+            self.pressed_actions.add(action)
+        else:
+            self.held_actions.discard(action)
+
+    def mouse_motion(self, x: float, y: float, dx: float, dy: float):
+        self.mouse_position = vec2(x, y)
+        self.mouse_movement += vec2(dx, dy)
+
+    def update(self, game_data: GameData):
+        game_data.actions = frozenset(self.held_actions | self.pressed_actions)
+        game_data.triggered_actions = frozenset(self.pressed_actions)
+        game_data.movement = movement_axes(game_data.actions)
+        game_data.mouse_position = self.mouse_position
+        game_data.mouse_movement = self.mouse_movement
+
+        self.pressed_actions = set()
+        self.mouse_movement = vec2()
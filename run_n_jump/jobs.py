@@ -0,0 +1,44 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class JobSystem:
+    """
+    Runs jobs on a thread pool. Without workers every job runs immediately on the calling thread.
+    NumPy releases the GIL during most array operations, so batched work can run in parallel.
+    Anything that touches GL has to stay on the main thread.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers
+        self.executor = None
+
+    def submit(self, function, *args) -> Future:
+        if self.workers == 0:
+            future = Future()
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        return self.executor.submit(function, *args)
+
+    def submit_after(self, dependencies: list, function, *args) -> Future:
+        """
+        Runs the function once all dependencies are done.
+        Dependencies have to be submitted earlier, then the queue order guarantees that they are already running.
+        """
+        return self.submit(wait_and_run, dependencies, function, args)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def wait_and_run(dependencies: list, function, args: tuple):
+    for dependency in dependencies:
+        dependency.result()
+    return function(*args)
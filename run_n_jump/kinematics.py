@@ -0,0 +1,232 @@
+import numpy as np
+
+from .math_helper import vec3
+
+KINEMATIC_VECTORS = ['position', 'velocity', 'acceleration']
+KINEMATIC_DEFAULTS = {'speed': 1, 'max_speed': np.inf}
+# number of entity lists whose rows are cached
+MAX_GATHERED = 8
+
+# velocities are in units per second, accelerations in units per second squared
+# acceleration of input driven movement
+ACCELERATION = 120.0
+# speed when starting to move from standstill, before it is clamped to the maximum speed
+START_SPEED = 120.0
+# deceleration of all moving entities
+DRAG = 60.0
+
+
+class KinematicAttribute:
+    """
+    While an entity is in a KinematicsStore the column of the store is the source of truth for this attribute.
+    Assignments write the row, reads only create a new vec3 after the store changed the row.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        store = entity.__dict__.get('_kinematics')
+        if store is not None:
+            return store.get(entity, self.name)
+        try:
+            return entity.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, entity, value):
+        entity.__dict__[self.name] = value
+        store = entity.__dict__.get('_kinematics')
+        if store is not None:
+            store.set(entity, self.name, value)
+
+    def __delete__(self, entity):
+        try:
+            del entity.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+class Kinematic:
+    """
+    Base class of entities that can be moved by a KinematicsStore
+    """
+    position = KinematicAttribute('position')
+    velocity = KinematicAttribute('velocity')
+    acceleration = KinematicAttribute('acceleration')
+    speed = KinematicAttribute('speed')
+    max_speed = KinematicAttribute('max_speed')
+
+
+class KinematicsStore:
+    """
+    Keeps position, velocity, acceleration, speed and max_speed of all moving entities in contiguous columns.
+    The columns are updated for all rows at once. Entities have to derive from Kinematic, so that assignments
+    to their attributes go straight into the columns and the vec3 attributes are only created again when
+    they are read after an update.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.acceleration = np.zeros((capacity, 3))
+        self.speed = np.ones(capacity)
+        self.max_speed = np.full(capacity, np.inf)
+        # rows whose vec3 attributes are older than the columns
+        self.stale = {name: np.zeros(capacity, dtype=bool) for name in KINEMATIC_VECTORS}
+
+        self.entities = []
+        self.rows = {}
+        # rows of recently gathered entity lists, until rows move
+        self.gathered = {}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        return entity in self.rows
+
+    @property
+    def capacity(self) -> int:
+        return len(self.speed)
+
+    def columns(self) -> list:
+        return [self.position, self.velocity, self.acceleration, self.speed, self.max_speed] + \
+            [self.stale[name] for name in KINEMATIC_VECTORS]
+
+    def grow(self):
+        capacity = self.capacity * 2
+        for name in KINEMATIC_VECTORS:
+            column = np.zeros((capacity, 3))
+            column[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, column)
+            stale = np.zeros(capacity, dtype=bool)
+            stale[:len(self)] = self.stale[name][:len(self)]
+            self.stale[name] = stale
+        for name, default in KINEMATIC_DEFAULTS.items():
+            column = np.full(capacity, default, dtype=float)
+            column[:len(self)] = getattr(self, name)[:len(self)]
+            setattr(self, name, column)
+
+    def add(self, entity) -> int:
+        if entity in self.rows:
+            return self.rows[entity]
+        if not isinstance(entity, Kinematic):
+            raise TypeError(f"{entity} has to derive from Kinematic to be moved by a KinematicsStore")
+        if len(self) == self.capacity:
+            self.grow()
+
+        row = len(self)
+        self.entities.append(entity)
+        self.rows[entity] = row
+        self.gathered.clear()
+        for name in KINEMATIC_VECTORS + list(KINEMATIC_DEFAULTS):
+            self.write(row, name, entity.__dict__.get(name))
+        entity.__dict__['_kinematics'] = self
+        return row
+
+    def remove(self, entity):
+        """
+        Moves the last row into the freed one, so the columns stay contiguous.
+        The entity keeps its current values as plain attributes.
+        """
+        for name in KINEMATIC_VECTORS:
+            if name in entity.__dict__ or self.stale[name][self.rows[entity]]:
+                self.get(entity, name)
+        del entity.__dict__['_kinematics']
+
+        row = self.rows.pop(entity)
+        last = len(self) - 1
+        last_entity = self.entities.pop()
+        if row != last:
+            for column in self.columns():
+                column[row] = column[last]
+            self.entities[row] = last_entity
+            self.rows[last_entity] = row
+        for name in KINEMATIC_VECTORS:
+            self.stale[name][last] = False
+        self.gathered.clear()
+
+    def write(self, row: int, name: str, value):
+        if name in KINEMATIC_VECTORS:
+            if value is None:
+                value = vec3()
+            getattr(self, name)[row] = (value.x, value.y, value.z)
+            self.stale[name][row] = False
+        else:
+            getattr(self, name)[row] = KINEMATIC_DEFAULTS[name] if value is None else value
+
+    def get(self, entity, name: str):
+        stale = self.stale.get(name)
+        if stale is not None:
+            row = self.rows[entity]
+            if stale[row]:
+                stale[row] = False
+                value = vec3(*getattr(self, name)[row].tolist())
+                entity.__dict__[name] = value
+                return value
+        try:
+            return entity.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def set(self, entity, name: str, value):
+        self.write(self.rows[entity], name, value)
+
+    def gather(self, entities: list) -> np.ndarray:
+        """
+        Returns the rows of the entities, entities that are not in the store yet are added
+        """
+        key = tuple(entities)
+        rows = self.gathered.get(key)
+        if rows is None:
+            rows = np.array([self.add(entity) for entity in entities], dtype=np.intp)
+            if len(self.gathered) >= MAX_GATHERED:
+                self.gathered.clear()
+            self.gathered[key] = rows
+        return rows
+
+    def invalidate(self, rows: np.ndarray, names: list):
+        """
+        Marks the attributes of the rows as changed after their columns were updated
+        """
+        for name in names:
+            self.stale[name][rows] = True
+
+
+def lengths(vectors: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+
+
+def accelerate(store: KinematicsStore, rows: np.ndarray, frame_time: float):
+    """
+    Applies drag and acceleration for frame_time seconds to the velocities and clamps them to the maximum speed
+    """
+    velocity = store.velocity[rows]
+    speed = lengths(velocity)
+    moving = speed > 0
+
+    drag = np.zeros_like(velocity)
+    drag[moving] = velocity[moving] / speed[moving, np.newaxis] * -DRAG
+    drag *= store.speed[rows, np.newaxis]
+
+    velocity += (store.acceleration[rows] + drag) * frame_time
+    speed = lengths(velocity)
+    max_speed = store.max_speed[rows]
+    too_fast = speed > max_speed
+    velocity[too_fast] *= (max_speed[too_fast] / speed[too_fast])[:, np.newaxis]
+
+    store.velocity[rows] = velocity
+    store.acceleration[rows] = 0
+
+
+def integrate(store: KinematicsStore, rows: np.ndarray, frame_time: float, offsets: np.ndarray = None):
+    """
+    Moves the entities by their velocity for frame_time seconds and by the given offsets, e.g. collision responses
+    """
+    position = store.position[rows] + store.velocity[rows] * frame_time
+    if offsets is not None:
+        position += offsets
+    store.position[rows] = position
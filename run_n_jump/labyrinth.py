@@ -1,3 +1,7 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from ctypes import c_float, sizeof
 
 import numpy as np
@@ -11,48 +15,33 @@ from .rectangle import rectangular_prism_vertices
 from .shader import Shader
 
 LABYRINTH_SCALE = 5
+BLOCK_SIZE = 15
+# blocks waiting in the pool for each process of generate_blocks
+QUEUED_BLOCKS_PER_PROCESS = 2
 
 
 def load_image(filename: str):
     labyrinth_map = Image.open(filename)
-    width = labyrinth_map.width
-    height = labyrinth_map.height
-    image_array = np.asarray(labyrinth_map).flatten()
-    map_array = np.zeros((width, height))
-    for row in range(height):
-        for col in range(width):
-            map_array[row, col] = image_array[row * width + col]
-    return map_array
+    return np.asarray(labyrinth_map, dtype=float).reshape(labyrinth_map.height, labyrinth_map.width)
 
 
 def save_image(arr: np.ndarray, filename: str):
-    im = Image.new('L', (arr.shape[1], arr.shape[0]))
-    im.putdata(arr.flatten().tolist())
+    im = Image.fromarray(arr.astype(np.uint8), 'L')
     im.save(f"{filename.split('.')[0]}_gen.png")
 
 
-def is_edge_pixel(arr: np.ndarray, row: int, col: int):
-    return arr[row, col] == 255 and (
-            row - 1 < 0 or
-            row + 1 >= arr.shape[0] or
-            col - 1 < 0 or
-            col + 1 >= arr.shape[1] or
-            arr[row + 1, col] == 0 or
-            arr[row + 1, col + 1] == 0 or
-            arr[row + 1, col - 1] == 0 or
-            arr[row - 1, col] == 0 or
-            arr[row - 1, col + 1] == 0 or
-            arr[row - 1, col - 1] == 0 or
-            arr[row, col + 1] == 0 or
-            arr[row, col - 1] == 0
-    )
-
-
 def mark_edges(arr: np.ndarray):
-    for row in range(arr.shape[0]):
-        for col in range(arr.shape[1]):
-            if is_edge_pixel(arr, row, col):
-                arr[row, col] = 128
+    """
+    Marks walkable pixels on the border of the image or next to a wall pixel with 128
+    """
+    rows, cols = arr.shape
+    # the padding makes border pixels neighbors of a wall
+    padded = np.pad(arr, 1, mode='constant', constant_values=0)
+    # the minimum over the 3x3 neighborhood is the minimum over the rows of the minimum over the columns
+    row_min = np.minimum(np.minimum(padded[:, :cols], padded[:, 1:cols + 1]), padded[:, 2:])
+    neighborhood_min = np.minimum(np.minimum(row_min[:rows], row_min[1:rows + 1]), row_min[2:])
+
+    arr[(arr == 255) & (neighborhood_min == 0)] = 128
     return arr
 
 
@@ -305,33 +294,6 @@ def generate_bounding_box(size: vec3, position: vec3):
 
 
 def create_bounding_box(vertices, normals, indices, position: vec3):
-    box = BoundingBox()
-    asset = ModelAsset()
-    asset.color = vec3(1, 0, 1)
-    asset.shader = Shader("shaders/bb_vertex.glsl", "shaders/bb_fragment.glsl")
-    asset.current_index_buffer_id = 1
-    stride = 6 * sizeof(c_float)
-    attributes = [
-        (0, 'a_Position', GL_FLOAT, 3, stride, 0),
-        (1, 'a_Normal', GL_FLOAT, 3, stride, 3 * sizeof(c_float))
-    ]
-    asset.attributes = attributes
-
-    asset.attribute_data = {'vertices': (3, vertices), 'normals': (3, normals)}
-
-    for draw_type, values in indices:
-        index_buffer = IndexBuffer()
-        index_buffer.draw_type = draw_type
-        index_buffer.draw_count = len(values)
-        index_buffer.indices = values
-        asset.index_buffers.append(index_buffer)
-
-    upload(asset)
-
-    add_mvp_uniforms(asset.uniforms)
-    add_light_uniforms(asset.uniforms)
-    asset.uniforms["u_Color"] = "color"
-
     def convert_to_vec3(arr: list):
         result = []
         for i in range(0, len(arr), 3):
@@ -340,11 +302,11 @@ def create_bounding_box(vertices, normals, indices, position: vec3):
                 result.append(vector)
         return result
 
+    box = BoundingBox()
     box.vertices = convert_to_vec3(vertices)
     box.normals = convert_to_vec3(normals)
     box.position = position
     box.radius = max(map(lambda v: v.length, box.vertices))
-    box.asset = asset
     return box
 
 
@@ -364,24 +326,136 @@ def generate_vertices(arr: np.ndarray, block_size: int):
     generate_left(arr, block_offset, vertices, normals, indices, bounding_boxes)
     generate_right(arr, block_offset, vertices, normals, indices, bounding_boxes)
 
-    return vertices, normals, [(GL_TRIANGLES, indices), (GL_LINES, get_line_indices(indices))], bounding_boxes
+    # only plain data, so blocks can be generated in other processes
+    return vertices, normals, (indices, get_line_indices(indices)), bounding_boxes
 
 
-def labyrinth(block_size: int = 15):
-    filename = "labyrinth.png"
+def load_labyrinth_map(filename: str = "labyrinth.png"):
     image_array = load_image(filename)
     image_array = mark_edges(image_array)
     save_image(image_array, filename)
+    return image_array
+
+
+def block_offsets(shape: tuple, block_size: int):
+    for row in range(0, shape[1], block_size - 2):
+        for col in range(0, shape[0], block_size - 2):
+            yield row, col
 
-    for row in range(0, image_array.shape[1], block_size - 2):
-        for col in range(0, image_array.shape[0], block_size - 2):
-            block = image_array[row:row + block_size, col:col + block_size]
-            vertices, normals, indices, bounding_boxes = generate_vertices(block, block_size)
-            if len(vertices) != 0:
-                yield row, col, block_size, vertices, normals, indices, bounding_boxes
 
+def generate_block(block: np.ndarray, row: int, col: int, block_size: int):
+    vertices, normals, indices, bounding_boxes = generate_vertices(block, block_size)
+    if len(vertices) == 0:
+        return None
+    bounding_boxes = [create_bounding_box(*item) for item in bounding_boxes]
+    return row, col, block_size, vertices, normals, indices, bounding_boxes
+
+
+def labyrinth(image_array: np.ndarray, block_size: int = BLOCK_SIZE):
+    for row, col in block_offsets(image_array.shape, block_size):
+        block = generate_block(image_array[row:row + block_size, col:col + block_size], row, col, block_size)
+        if block is not None:
+            yield block
+
+
+def generate_blocks(image_array: np.ndarray, block_size: int = BLOCK_SIZE, processes: int = None, progress=None):
+    """
+    Generates the blocks of labyrinth() in a pool of processes and yields them in the order they are finished,
+    which differs between runs. Only a few blocks per process are submitted at a time, so closing the generator
+    only waits for the blocks that are already being generated.
+    progress is called with the number of finished blocks and the number of all blocks.
+    """
+    offsets = list(block_offsets(image_array.shape, block_size))
+    window = (processes or os.cpu_count() or 1) * QUEUED_BLOCKS_PER_PROCESS
+    with ProcessPoolExecutor(processes) as executor:
+        pending = set()
+        submitted = 0
+        done = 0
+        try:
+            while submitted < len(offsets) or pending:
+                while submitted < len(offsets) and len(pending) < window:
+                    row, col = offsets[submitted]
+                    pending.add(executor.submit(generate_block, image_array[row:row + block_size, col:col + block_size],
+                                                row, col, block_size))
+                    submitted += 1
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += 1
+                    block = future.result()
+                    if progress is not None:
+                        progress(done, len(offsets))
+                    if block is not None:
+                        yield block
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class LabyrinthLoader:
+    """
+    Generates the blocks of a labyrinth on a background thread, so only the upload of finished blocks
+    has to happen on the main thread. Without background the blocks are generated when they are requested.
+    With processes the blocks are generated by generate_blocks, in the order they are finished.
+    close() has to be called when the loader is abandoned, to stop the background thread and processes.
+    """
+
+    def __init__(self, image_array: np.ndarray, block_size: int = BLOCK_SIZE, background: bool = True, processes: int = 0,
+                 progress=None):
+        if processes > 0:
+            self.generator = generate_blocks(image_array, block_size, processes, progress)
+        else:
+            self.generator = labyrinth(image_array, block_size)
+        self.finished = None
+        self.thread = None
+        self.closed = threading.Event()
+        if background:
+            self.finished = queue.Queue()
+            self.thread = threading.Thread(target=self.generate, name="LabyrinthLoader", daemon=True)
+            self.thread.start()
+
+    def generate(self):
+        try:
+            for block in self.generator:
+                if self.closed.is_set():
+                    break
+                self.finished.put(block)
+        except Exception as e:
+            self.finished.put(e)
+        else:
+            self.finished.put(StopIteration())
+        finally:
+            self.generator.close()
+
+    def close(self):
+        """
+        Stops generating blocks, waits only for the blocks that are already being generated
+        """
+        self.closed.set()
+        if self.thread is not None:
+            self.thread.join()
+        else:
+            self.generator.close()
 
-def create_labyrinth(row_offset: int, col_offset: int, block_size: int, vertices, normals, indices, bounding_boxes):
+    def ready(self) -> bool:
+        return self.finished is None or not self.finished.empty()
+
+    def next_block(self):
+        """
+        Returns the next block, waits for it to be generated if necessary. Raises StopIteration after the last block
+        and errors of the background thread.
+        """
+        if self.finished is None:
+            return next(self.generator)
+
+        block = self.finished.get()
+        if isinstance(block, Exception):
+            # keep the end of the blocks or the error for further calls
+            self.finished.put(block)
+            raise block
+        return block
+
+
+def labyrinth_asset(vertices, normals, indices):
     asset = ModelAsset()
     asset.shader = Shader("shaders/model_vertex.glsl", "shaders/model_fragment.glsl")
     stride = 6 * sizeof(c_float)
@@ -391,11 +465,9 @@ def create_labyrinth(row_offset: int, col_offset: int, block_size: int, vertices
     ]
     asset.attributes = attributes
 
-    if len(vertices) == 0:
-        return None
     asset.attribute_data = {'vertices': (3, vertices), 'normals': (3, normals)}
 
-    for draw_type, values in indices:
+    for draw_type, values in zip((GL_TRIANGLES, GL_LINES), indices):
         index_buffer = IndexBuffer()
         index_buffer.draw_type = draw_type
         index_buffer.draw_count = len(values)
@@ -407,16 +479,26 @@ def create_labyrinth(row_offset: int, col_offset: int, block_size: int, vertices
     asset.uniforms["u_Color"] = "color"
 
     upload(asset)
+    return asset
+
+
+def create_labyrinth(row_offset: int, col_offset: int, block_size: int, vertices, normals, indices, bounding_boxes,
+                     render: bool = True):
+    if len(vertices) == 0:
+        return None
 
     model = ModelInstance()
-    model.asset = asset
-    model.bounding_boxes = [create_bounding_box(*item) for item in bounding_boxes]
+    if render:
+        model.asset = labyrinth_asset(vertices, normals, indices)
+    model.bounding_boxes = bounding_boxes
     model.scale = LABYRINTH_SCALE
     model.position = vec3((col_offset + block_size / 2) * model.scale, 0, (row_offset + block_size / 2) * model.scale)
     model.name = f"Labyrinth {model.position}"
+    model.world_geometry = True
     model.systems = [
         'position',
-        'render'
+        'render',
+        'bbrender'
     ]
     model.model_matrix = identity()
     scale(model.model_matrix, model.scale)
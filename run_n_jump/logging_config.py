@@ -1,16 +1,92 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import warnings
+
+# e.g. RUN_N_JUMP_LOG="WARNING,Collision=DEBUG,run_n_jump.game=INFO", a level without a name is the default
+LOG_LEVEL_VARIABLE = "RUN_N_JUMP_LOG"
+DEFAULT_LEVEL = logging.INFO
 
 loggers = []
+log_queue = queue.Queue()
+listener = None
+
+
+def parse_level(text: str):
+    """
+    Returns the number of a level name or None if there is no such level
+    """
+    text = text.strip().upper()
+    if text.isdigit():
+        return int(text)
+    level = logging.getLevelName(text)
+    return level if isinstance(level, int) else None
+
+
+def parse_levels(value: str) -> dict:
+    """
+    Unknown levels are skipped with a warning, so a typo in the environment does not stop the game
+    """
+    levels = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if entry == "":
+            continue
+        name, _, text = entry.rpartition("=")
+        level = parse_level(text)
+        if level is None:
+            warnings.warn(f"Ignoring unknown log level in {LOG_LEVEL_VARIABLE}: {entry}")
+            continue
+        levels[name if name != "" else None] = level
+    return levels
+
+
+def get_level(name: str, levels: dict) -> int:
+    """
+    Uses the level of the logger or of its closest configured parent
+    """
+    while name:
+        if name in levels:
+            return levels[name]
+        name = name.rpartition(".")[0]
+    return levels.get(None, DEFAULT_LEVEL)
+
+
+levels = parse_levels(os.environ.get(LOG_LEVEL_VARIABLE, ""))
+
+
+def start_listener():
+    """
+    Log records are written by a background thread, so a slow terminal never blocks a frame
+    """
+    global listener
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s - %(name)-+9.9s - %(levelname)-8.8s - %(message)s')
+    handler.setFormatter(formatter)
+
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(stop_listener)
+
+
+def stop_listener():
+    global listener
+    if listener is not None:
+        # writes all records that are still queued
+        listener.stop()
+        listener = None
 
 
 def getLogger(name: str = None):
     logger = logging.getLogger(name)
     if name not in loggers:
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(name)-+9.9s - %(levelname)-8.8s - %(message)s')
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+        if listener is None:
+            start_listener()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(get_level(name, levels))
         loggers.append(name)
     return logger
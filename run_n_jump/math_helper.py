@@ -253,6 +253,18 @@ class mat4:
         return res
 
 
+def transform_direction(m: mat4, v: vec3) -> vec3:
+    """
+    Applies only the upper 3x3 part of the matrix, so translations do not affect directions
+    """
+    n = m.numbers
+    return vec3(
+        n[0][0] * v.x + n[0][1] * v.y + n[0][2] * v.z,
+        n[1][0] * v.x + n[1][1] * v.y + n[1][2] * v.z,
+        n[2][0] * v.x + n[2][1] * v.y + n[2][2] * v.z
+    )
+
+
 def identity():
     return mat4([
         [1, 0, 0, 0],
@@ -1,11 +1,14 @@
 from ctypes import sizeof
 
+import numpy as np
+
 from pyglet.gl import GLuint, glGenTextures, glGenBuffers, glGenVertexArrays, GL_STATIC_DRAW, GLint, GLfloat
 from pyglet.gl import glBindTexture, GL_TEXTURE_2D, glTexParameterf, GL_TEXTURE_MAG_FILTER, GL_LINEAR, GL_TEXTURE_MIN_FILTER
 from pyglet.gl import glTexImage2D, GL_ALPHA, GLubyte, glBindBuffer, glBufferData, GL_ELEMENT_ARRAY_BUFFER, GL_ARRAY_BUFFER
-from pyglet.gl import GL_TRIANGLES, GL_LINES
+from pyglet.gl import GL_TRIANGLES, GL_LINES, glDeleteBuffers, glDeleteVertexArrays
 
-from .math_helper import identity, vec3
+from .kinematics import Kinematic
+from .math_helper import identity, vec3, mat4, transform_direction
 
 
 class Texture:
@@ -64,13 +67,105 @@ class ModelAsset:
 class BoundingBox:
     def __init__(self):
         self.vertices = []
+        self.axes = []
         self.normals = []
         self.position = vec3()
         self.model_matrix = identity()
         self.type = 'static'
 
+        self._rotation_key = None
+        self._rotated_axes = []
+
+    @property
+    def vertices(self):
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices: list):
+        self._vertices = vertices
+        self.vertex_array = np.array([vertex.to_list() for vertex in vertices]).reshape((-1, 3))
+        self.invalidate()
+
+    @property
+    def model_matrix(self):
+        return self._model_matrix
+
+    @model_matrix.setter
+    def model_matrix(self, model_matrix: mat4):
+        """
+        World space caches are only refreshed when a new matrix is assigned, not when it is modified in place
+        """
+        self._model_matrix = model_matrix
+        self.invalidate()
+
+    def invalidate(self):
+        self._world_vertex_array = None
+        self._world_vertices = None
+        self._world_position = None
+
+    @property
+    def world_vertex_array(self) -> np.ndarray:
+        if self._world_vertex_array is None:
+            matrix = np.array(self._model_matrix.numbers)
+            self._world_vertex_array = self.vertex_array @ matrix[:3, :3].T + matrix[:3, 3]
+        return self._world_vertex_array
+
+    @property
+    def world_vertices(self) -> list:
+        if self._world_vertices is None:
+            self._world_vertices = [vec3(*map(float, vertex)) for vertex in self.world_vertex_array]
+        return self._world_vertices
+
+    @property
+    def world_position(self) -> vec3:
+        if self._world_position is None:
+            self._world_position = self._model_matrix * vec3()
+        return self._world_position
+
+    @property
+    def normals(self):
+        return self._normals
+
+    @normals.setter
+    def normals(self, normals: list):
+        self._normals = normals
+        self.axes = unique_axes(normals)
+        self._rotation_key = None
+
+    def rotated_axes(self, rotation_matrix: mat4) -> list:
+        key = tuple(tuple(row[:3]) for row in rotation_matrix.numbers[:3])
+        if key != self._rotation_key:
+            self._rotated_axes = [transform_direction(rotation_matrix, axis).normalize() for axis in self.axes]
+            self._rotation_key = key
+        return self._rotated_axes
+
+
+def unique_axes(normals: list, precision: int = 6) -> list:
+    """
+    Normalizes the given normals and collapses opposite directions,
+    because a separating axis test only needs one of them
+    """
+    axes = []
+    seen = set()
+    for normal in normals:
+        if normal.length == 0:
+            continue
+
+        axis = normal.copy().normalize()
+        for component in axis.to_list():
+            if round(component, precision) != 0:
+                if component < 0:
+                    axis = axis * -1
+                break
+
+        key = tuple(round(component, precision) for component in axis.to_list())
+        if key not in seen:
+            seen.add(key)
+            axes.append(axis)
+    return axes
 
-class ModelInstance:
+
+class ModelInstance(Kinematic):
     asset: ModelAsset = None
     model_matrix = None
     name = "ModelInstance"
@@ -133,6 +228,15 @@ def upload(asset: ModelAsset, gl_usage=GL_STATIC_DRAW):
                      asset.texture.type, texture_data)
 
 
+def release(asset: ModelAsset):
+    for buffer in asset.index_buffers:
+        glDeleteBuffers(1, buffer.id)
+    glDeleteBuffers(1, asset.vertex_buffer_id)
+    glDeleteVertexArrays(1, asset.vertex_array_id)
+    asset.vertex_buffer_id = -1
+    asset.vertex_array_id = -1
+
+
 def upload_indices(asset: ModelAsset, gl_usage=GL_STATIC_DRAW):
     for buffer in asset.index_buffers:
         # noinspection PyCallingNonCallable,PyTypeChecker
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# added to every translation, so touching boxes are still pushed apart
+TRANSLATION_EPSILON = 0.000000000000001
+
+
+def pad_rows(arrays: list) -> np.ndarray:
+    """
+    Stacks arrays with different row counts by repeating their first row.
+    Repeated vertices and axes do not change the result of a projection.
+    """
+    length = max(map(len, arrays))
+    result = np.empty((len(arrays), length, 3))
+    for index, arr in enumerate(arrays):
+        result[index, :len(arr)] = arr
+        result[index, len(arr):] = arr[0]
+    return result
+
+
+def pack_pairs(pairs: list) -> dict:
+    """
+    Converts a list of (box, box_axes, other_box, other_axes) into one batch of plain arrays
+    """
+    boxes = [pair[0] for pair in pairs]
+    others = [pair[2] for pair in pairs]
+    return {
+        'box_vertices': pad_rows([box.vertex_array for box in boxes]),
+        'box_matrices': np.array([box.model_matrix.numbers for box in boxes]),
+        'other_vertices': pad_rows([other.vertex_array for other in others]),
+        'other_matrices': np.array([other.model_matrix.numbers for other in others]),
+        'axes': np.concatenate([
+            pad_rows([[axis.to_list() for axis in pair[1]] for pair in pairs]),
+            pad_rows([[axis.to_list() for axis in pair[3]] for pair in pairs]),
+        ], axis=1),
+    }
+
+
+def split_batch(batch: dict, parts: int) -> list:
+    chunks = {key: np.array_split(value, parts) for key, value in batch.items()}
+    return [{key: chunks[key][index] for key in chunks} for index in range(parts)]
+
+
+def transform_points(matrices: np.ndarray, points: np.ndarray) -> np.ndarray:
+    return np.einsum('pij,pvj->pvi', matrices[:, :3, :3], points) + matrices[:, np.newaxis, :3, 3]
+
+
+def project(points: np.ndarray, axes: np.ndarray):
+    projections = np.einsum('pvk,pak->pav', points, axes)
+    return projections.min(axis=2), projections.max(axis=2)
+
+
+def narrowphase(batch: dict):
+    """
+    Separating axis test for a whole batch of box pairs.
+    Returns for every pair whether it collides and the translation that pushes the first box out of the second.
+    """
+    box_points = transform_points(batch['box_matrices'], batch['box_vertices'])
+    other_points = transform_points(batch['other_matrices'], batch['other_vertices'])
+    axes = batch['axes']
+
+    min_box, max_box = project(box_points, axes)
+    min_other, max_other = project(other_points, axes)
+    overlaps = np.minimum(max_box, max_other) - np.maximum(min_box, min_other)
+    collides = np.all(overlaps >= 0, axis=1)
+
+    pair_indices = np.arange(len(axes))
+    axis_indices = np.argmin(overlaps, axis=1)
+    minimum_overlaps = overlaps[pair_indices, axis_indices] + TRANSLATION_EPSILON
+    translations = axes[pair_indices, axis_indices] * minimum_overlaps[:, np.newaxis]
+
+    centers = batch['box_matrices'][:, :3, 3] - batch['other_matrices'][:, :3, 3]
+    directions = np.sign(np.einsum('pk,pk->p', centers, translations))
+    translations *= directions[:, np.newaxis]
+    return collides, translations
+
+
+class NarrowphasePool:
+    """
+    Runs the narrowphase on a process pool.
+    Batches are split into one chunk per worker and merged in submission order, so results are deterministic.
+    """
+
+    def __init__(self, workers: int, min_batch_size: int = 64):
+        self.workers = workers
+        self.min_batch_size = min_batch_size
+        self.executor = None
+
+    def run(self, batch: dict):
+        pair_count = len(batch['axes'])
+        if pair_count < self.min_batch_size:
+            return narrowphase(batch)
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        parts = min(self.workers, pair_count)
+        results = list(self.executor.map(narrowphase, split_batch(batch, parts)))
+        collides = np.concatenate([result[0] for result in results])
+        translations = np.concatenate([result[1] for result in results])
+        return collides, translations
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
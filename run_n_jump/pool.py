@@ -0,0 +1,106 @@
+import numpy as np
+
+from .math_helper import vec3
+
+
+class EntityPool:
+    """
+    Hands out integer ids for entities. The ids of removed entities are reused,
+    so storage that is indexed by id stays as small as the number of live entities.
+    The contacts of a released id are dropped, so the next entity with that id starts without contacts.
+    """
+
+    def __init__(self, contacts: 'ContactBuffer' = None):
+        self.slots = []
+        self.free_ids = []
+        self.contacts = contacts
+
+    def __len__(self):
+        return len(self.slots) - len(self.free_ids)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.slots)
+
+    def acquire(self, entity) -> int:
+        if len(self.free_ids) > 0:
+            entity_id = self.free_ids.pop()
+            self.slots[entity_id] = entity
+        else:
+            entity_id = len(self.slots)
+            self.slots.append(entity)
+        entity.entity_id = entity_id
+        return entity_id
+
+    def release(self, entity):
+        entity_id = entity.entity_id
+        self.slots[entity_id] = None
+        self.free_ids.append(entity_id)
+        if self.contacts is not None:
+            self.contacts.release(entity_id)
+        del entity.entity_id
+
+    def get(self, entity_id: int):
+        return self.slots[entity_id]
+
+
+class ContactBuffer:
+    """
+    Preallocated storage for the collision responses of one frame, indexed by entity id.
+    Clearing only resets the counters, so collisions do not allocate anything once the buffer is large enough.
+    """
+
+    def __init__(self, capacity: int = 64, max_contacts: int = 8):
+        self.contacts = np.zeros((capacity, max_contacts, 3))
+        self.counts = np.zeros(capacity, dtype=np.intp)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.counts))
+
+    def grow(self, capacity: int, max_contacts: int):
+        contacts = np.zeros((capacity, max_contacts, 3))
+        contacts[:self.contacts.shape[0], :self.contacts.shape[1]] = self.contacts
+        counts = np.zeros(capacity, dtype=np.intp)
+        counts[:len(self.counts)] = self.counts
+        self.contacts = contacts
+        self.counts = counts
+
+    def add(self, entity_id: int, contact: vec3):
+        capacity, max_contacts, _ = self.contacts.shape
+        if entity_id >= capacity:
+            self.grow(max(capacity * 2, entity_id + 1), max_contacts)
+        count = self.counts[entity_id]
+        if count == max_contacts:
+            self.grow(self.contacts.shape[0], max_contacts * 2)
+        self.contacts[entity_id, count] = (contact.x, contact.y, contact.z)
+        self.counts[entity_id] = count + 1
+
+    def get(self, entity_id: int) -> list:
+        if entity_id >= len(self.counts):
+            return []
+        return [vec3(*contact) for contact in self.contacts[entity_id, :self.counts[entity_id]].tolist()]
+
+    def resolve(self, entity_ids: np.ndarray) -> np.ndarray:
+        """
+        Combines all contacts of every entity into a single correction.
+        Per axis the largest push in each direction wins, so overlapping walls do not add up.
+        """
+        result = np.zeros((len(entity_ids), 3))
+        known = entity_ids < len(self.counts)
+        contacts = self.contacts[entity_ids[known]]
+        valid = np.arange(contacts.shape[1]) < self.counts[entity_ids[known], np.newaxis]
+        contacts = np.where(valid[:, :, np.newaxis], contacts, 0)
+        result[known] = np.maximum(contacts.max(axis=1), 0) + np.minimum(contacts.min(axis=1), 0)
+        return result
+
+    def pop(self, entity_ids: np.ndarray) -> np.ndarray:
+        result = self.resolve(entity_ids)
+        self.counts[entity_ids[entity_ids < len(self.counts)]] = 0
+        return result
+
+    def release(self, entity_id: int):
+        if entity_id < len(self.counts):
+            self.counts[entity_id] = 0
+
+    def clear(self):
+        self.counts[:] = 0
@@ -0,0 +1,88 @@
+import json
+
+from .game_data import GameData
+from .input_state import movement_axes
+from .math_helper import vec2
+
+
+class InputRecorder:
+    """
+    Captures the input of every tick, so a run can be replayed exactly.
+    The labyrinth is loaded in the background while playing, so the blocks that were loaded in every tick
+    are recorded as well.
+    """
+
+    def __init__(self, seed: int, grid_collision: bool = False):
+        self.seed = seed
+        self.grid_collision = grid_collision
+        self.frames = []
+
+    def record(self, game_data: GameData):
+        self.frames.append({
+            'frame_time': game_data.frame_time,
+            'actions': sorted(game_data.actions),
+            'triggered_actions': sorted(game_data.triggered_actions),
+            'mouse_position': game_data.mouse_position.to_list(),
+            'mouse_movement': game_data.mouse_movement.to_list(),
+            'labyrinth_blocks': [],
+        })
+
+    def record_labyrinth_blocks(self, offsets: list):
+        """
+        Adds the blocks that were loaded in the tick after the last recorded input
+        """
+        self.frames[-1]['labyrinth_blocks'] = [list(offset) for offset in offsets]
+
+    def save(self, filename: str):
+        with open(filename, "w") as f:
+            json.dump({'seed': self.seed, 'grid_collision': self.grid_collision, 'frames': self.frames}, f)
+
+
+def idle_recording(ticks: int, frame_time: float, seed: int = None, grid_collision: bool = False) -> dict:
+    """
+    A recording of ticks frames without any input
+    """
+    frame = {
+        'frame_time': frame_time,
+        'actions': [],
+        'triggered_actions': [],
+        'mouse_position': [0, 0],
+        'mouse_movement': [0, 0],
+    }
+    return {'seed': seed, 'grid_collision': grid_collision, 'frames': [frame] * ticks}
+
+
+def load_recording(filename: str) -> dict:
+    with open(filename, "r") as f:
+        return json.load(f)
+
+
+def apply_frame(game_data: GameData, frame: dict):
+    game_data.frame_time = frame['frame_time']
+    game_data.actions = frozenset(frame['actions'])
+    game_data.triggered_actions = frozenset(frame['triggered_actions'])
+    game_data.movement = movement_axes(game_data.actions)
+    game_data.mouse_position = vec2(*frame['mouse_position'])
+    game_data.mouse_movement = vec2(*frame['mouse_movement'])
+
+
+def records_labyrinth(recording: dict) -> bool:
+    """
+    Older recordings do not contain the loaded labyrinth blocks
+    """
+    return all('labyrinth_blocks' in frame for frame in recording['frames'])
+
+
+def replay(game, game_data: GameData, recording: dict, before_tick=None):
+    """
+    Without recorded labyrinth blocks the game has to load the labyrinth itself.
+    before_tick is called before every tick, e.g. to measure the tick times.
+    """
+    load_blocks = records_labyrinth(recording)
+    for frame in recording['frames']:
+        apply_frame(game_data, frame)
+        if before_tick is not None:
+            before_tick()
+        game.tick(game_data)
+        if load_blocks:
+            game.load_labyrinth_blocks(frame['labyrinth_blocks'])
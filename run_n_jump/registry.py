@@ -0,0 +1,123 @@
+from .pool import EntityPool, ContactBuffer
+
+
+class Archetype:
+    """
+    All entities that have exactly the same components and systems
+    """
+
+    def __init__(self, components: frozenset, systems: frozenset):
+        self.components = components
+        self.systems = systems
+        self.entities = []
+
+    def __str__(self):
+        return f"Archetype[{', '.join(sorted(self.components))} | {', '.join(sorted(self.systems))}]"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class EntityRegistry:
+    """
+    Groups entities into archetypes and keeps the matching entities of every system up to date.
+    Every registered entity gets an entity_id from the pool, the contacts are reset when an id is released.
+    Components have to be added and removed through the registry, so that the matches only change
+    when the components of an entity change.
+    """
+
+    def __init__(self, systems: dict, contacts: ContactBuffer = None):
+        self.systems = systems
+        self.components = set()
+        for system in systems.values():
+            self.components.update(system.components)
+            self.components.update(system.optional_components)
+
+        self.pool = EntityPool(contacts)
+        self.entities = []
+        self.archetypes = {}
+        self.entity_archetypes = {}
+        # dicts are used as insertion ordered sets
+        self.system_entities = {name: {} for name in systems}
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        return entity in self.entity_archetypes
+
+    def get_archetype(self, entity) -> Archetype:
+        components = frozenset(c for c in self.components if hasattr(entity, c))
+        systems = frozenset(getattr(entity, 'systems', []))
+        key = (components, systems)
+        if key not in self.archetypes:
+            self.archetypes[key] = Archetype(components, systems)
+        return self.archetypes[key]
+
+    def matching_systems(self, archetype: Archetype) -> list:
+        result = []
+        for name in archetype.systems:
+            if name not in self.systems:
+                continue
+            system = self.systems[name]
+            if all(c in archetype.components for c in system.components):
+                result.append(name)
+        return result
+
+    def add(self, entity):
+        if entity in self.entity_archetypes:
+            return
+        self.pool.acquire(entity)
+        self.entities.append(entity)
+        self.assign(entity, self.get_archetype(entity))
+
+    def remove(self, entity):
+        if entity not in self.entity_archetypes:
+            return
+        self.entities.remove(entity)
+        for name in self.matching_systems(self.entity_archetypes[entity]):
+            self.systems[name].remove(entity)
+        self.unassign(entity)
+        self.pool.release(entity)
+
+    def assign(self, entity, archetype: Archetype):
+        archetype.entities.append(entity)
+        self.entity_archetypes[entity] = archetype
+        for name in self.matching_systems(archetype):
+            self.system_entities[name][entity] = None
+
+    def unassign(self, entity):
+        archetype = self.entity_archetypes.pop(entity)
+        archetype.entities.remove(entity)
+        for name in self.matching_systems(archetype):
+            del self.system_entities[name][entity]
+
+    def update(self, entity):
+        """
+        Moves the entity into its new archetype after its components or systems changed
+        """
+        archetype = self.get_archetype(entity)
+        previous = self.entity_archetypes[entity]
+        if previous is archetype:
+            return
+        self.unassign(entity)
+        self.assign(entity, archetype)
+        for name in set(self.matching_systems(previous)) - set(self.matching_systems(archetype)):
+            self.systems[name].remove(entity)
+
+    def add_component(self, entity, name: str, value):
+        had_component = hasattr(entity, name)
+        setattr(entity, name, value)
+        if not had_component and entity in self.entity_archetypes:
+            self.update(entity)
+
+    def remove_component(self, entity, name: str):
+        delattr(entity, name)
+        if entity in self.entity_archetypes:
+            self.update(entity)
+
+    def matches(self, system_name: str, entity) -> bool:
+        return entity in self.system_entities.get(system_name, ())
+
+    def query(self, system_name: str) -> list:
+        return list(self.system_entities[system_name])
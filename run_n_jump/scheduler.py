@@ -0,0 +1,84 @@
+from .game_data import GameData
+from .jobs import JobSystem
+from .registry import EntityRegistry
+from .tracing import tracer
+
+
+class Scheduler:
+    """
+    Runs every system once per frame over all of its entities, in a fixed global order.
+    The declared reads and writes of the systems tell which systems depend on each other.
+    With a job system, batched systems run on the job threads while the calling thread goes on with the systems
+    that do not depend on them. All other systems run in order on the calling thread, threads would only add
+    overhead to them because they hold the GIL.
+    """
+
+    def __init__(self, systems: dict, registry: EntityRegistry, order: list, jobs: JobSystem = None):
+        self.systems = systems
+        self.registry = registry
+        self.order = order
+        self.jobs = jobs
+
+        for name in order:
+            if name not in systems:
+                raise KeyError(f"Unknown system '{name}' in system order")
+
+        self.system_dependencies = self.dependencies()
+
+    @staticmethod
+    def conflicts(system, other) -> bool:
+        return bool(
+            system.writes & (other.reads | other.writes) or
+            other.writes & system.reads
+        )
+
+    def dependencies(self) -> dict:
+        """
+        Maps every system to the earlier systems it has to wait for
+        """
+        result = {}
+        for index, name in enumerate(self.order):
+            system = self.systems[name]
+            result[name] = [
+                other_name for other_name in self.order[:index]
+                if self.conflicts(system, self.systems[other_name])
+            ]
+        return result
+
+    def run_system(self, name: str, game_data: GameData, entities: list):
+        with tracer.span(name):
+            self.systems[name].run_all(game_data, entities)
+
+    def system_entities(self, name: str, entities: set) -> list:
+        """
+        The precomputed entities of the system that are among the given entities, in the order they were registered
+        """
+        return [entity for entity in self.registry.system_entities[name] if entity in entities]
+
+    def run(self, game_data: GameData, entities: list):
+        # only the entities found by the quad tree queries are updated, some are found by several queries
+        entities = set(entities)
+        if self.jobs is None or self.jobs.workers == 0:
+            for name in self.order:
+                system_entities = self.system_entities(name, entities)
+                if len(system_entities) > 0:
+                    self.run_system(name, game_data, system_entities)
+            return
+
+        jobs = {}
+        for name in self.order:
+            system_entities = self.system_entities(name, entities)
+            if len(system_entities) == 0:
+                continue
+
+            system = self.systems[name]
+            dependencies = [jobs[other] for other in self.system_dependencies[name] if other in jobs]
+            if system.main_thread or not system.batched:
+                for dependency in dependencies:
+                    dependency.result()
+                self.run_system(name, game_data, system_entities)
+            else:
+                jobs[name] = self.jobs.submit_after(dependencies, self.run_system, name, game_data, system_entities)
+
+        for job in jobs.values():
+            job.result()
@@ -1,4 +1,3 @@
-import logging
 from builtins import bytes
 from ctypes import (
     byref, c_char, c_char_p, c_int, c_float, cast, create_string_buffer, pointer,
@@ -21,7 +20,6 @@ NUMBER_OF_LIGHTS_PLACEHOLDER = "LIGHTS"
 class Shader:
     def __init__(self, vertex_shader_name: str = "", fragment_shader_name: str = "", number_of_lights: int = 2):
         self.log = logging_config.getLogger(__name__)
-        self.log.setLevel(logging.INFO)
 
         self.handle = None
         self.linked = False
@@ -50,6 +48,11 @@ class Shader:
 
         self.link()
 
+    def delete(self):
+        if self.handle is not None:
+            glDeleteProgram(self.handle)
+            self.handle = None
+
     def create_shader(self, strings, t):
         count = len(strings)
         # if we have no source code, ignore this shader
@@ -121,8 +124,6 @@ class Shader:
         if index > -1:
             name = f"{name}[{index}]"
 
-        self.log.debug(f"Binding {name} with data: {data}")
-
         data_type = type(data)
         if data_type == mat4:
             self.uniform_matrixf(name, data)
@@ -146,8 +147,6 @@ class Shader:
 
         else:
             self.log.error(f"Could not bind {name}")
-            return
-        self.log.debug(f"Bound {name} with data: {data}")
 
     def uniformf(self, name: str, *vals):
         # upload a floating point uniform
@@ -1,29 +1,51 @@
-import logging
+from time import perf_counter
 
-import pyglet
+import numpy as np
 from pyglet.gl import glBindVertexArray, glBindBuffer, GL_ARRAY_BUFFER, glVertexAttribPointer, GL_FALSE
 from pyglet.gl import glEnableVertexAttribArray, glBindAttribLocation, GL_ELEMENT_ARRAY_BUFFER, glDrawElements, GL_UNSIGNED_INT
 from pyglet.gl import glActiveTexture, glBindTexture, GL_TEXTURE_2D
 
 import run_n_jump.logging_config as logging_config
 from .game_data import GameData
+from .grid_collision import OccupancyGrid
+from .helper import CallTimings
+from .kinematics import KinematicsStore, accelerate, integrate, ACCELERATION, START_SPEED
 from .math_helper import identity, translate, vec3, rotate, vec2, scale, dot, mat4
-from .model import BoundingBox
+from .debug_render import bounding_box_model, update_bounding_box_model
+from .model import BoundingBox, release
+from .narrowphase import NarrowphasePool, pack_pairs
+from .shader import Shader
 from .text import update_text
+from .tracing import tracer
+
+# degrees of rotation per unit of mouse movement, the mouse movement is collected until a simulation step uses it
+MOUSE_ROTATION = 100 / 120
 
 
 class System:
-    def __init__(self, name, components: list = None, optional_components: list = None):
+    # systems that use GL have to run on the main thread
+    main_thread = False
+    # only systems whose work is mostly NumPy calls, which release the GIL, are run on the job threads
+    batched = False
+
+    def __init__(self, name, components: list = None, optional_components: list = None, reads: list = None,
+                 writes: list = None):
         if components is None:
             components = []
         if optional_components is None:
             optional_components = []
+        if reads is None:
+            reads = components + optional_components
+        if writes is None:
+            writes = []
         self.components = components
         self.optional_components = optional_components
+        self.reads = set(reads)
+        self.writes = set(writes)
         self.name = name
+        self.timings = CallTimings()
 
         self.log = logging_config.getLogger(self.name)
-        self.log.setLevel(logging.INFO)
 
     def supports(self, entity):
         for component in self.components:
@@ -34,9 +56,27 @@ class System:
     def reset(self, game_data: GameData):
         pass
 
+    def remove(self, entity):
+        """
+        Called when the entity no longer belongs to the system
+        """
+        pass
+
     def run(self, game_data: GameData, entity):
         pass
 
+    def run_all(self, game_data: GameData, entities: list):
+        for entity in entities:
+            start = perf_counter()
+            self.run(game_data, entity)
+            self.timings.add(perf_counter() - start)
+
+    def publish_timings(self, game_data: GameData):
+        summary = self.timings.summary()
+        for key in summary:
+            game_data.debug_data[f"{self.name}_{key}"] = summary[key]
+        self.timings.clear()
+
     def __repr__(self):
         return self.__str__()
 
@@ -46,17 +86,16 @@ class System:
 
 class GlobalInputSystem(System):
     def __init__(self):
-        super().__init__("GlobalInput")
+        super().__init__("GlobalInput", reads=['triggered_actions', 'camera', 'player_configuration'],
+                         writes=['wireframe', 'show_overview', 'collision_boxes', 'camera'])
 
     def run(self, game_data: GameData, entity):
-        if pyglet.window.key.SPACE in game_data.key_map and game_data.key_map[pyglet.window.key.SPACE]:
+        if 'toggle_wireframe' in game_data.triggered_actions:
             game_data.wireframe = not game_data.wireframe
-            del game_data.key_map[pyglet.window.key.SPACE]
             self.log.info(f"Switched to wireframe={game_data.wireframe}")
 
-        if pyglet.window.key.O in game_data.key_map and game_data.key_map[pyglet.window.key.O]:
+        if 'toggle_overview' in game_data.triggered_actions:
             game_data.show_overview = not game_data.show_overview
-            del game_data.key_map[pyglet.window.key.O]
             if game_data.show_overview:
                 game_data.camera.position = vec3(250, 100, 250)
                 game_data.camera.rotation = vec3(90, 0, 0)
@@ -68,13 +107,23 @@ class GlobalInputSystem(System):
             self.log.info(
                 f"Switched to show_overview={game_data.show_overview}")
 
+        if 'toggle_collision_boxes' in game_data.triggered_actions:
+            game_data.collision_boxes = not game_data.collision_boxes
+            self.log.info(f"Switched to collision_boxes={game_data.collision_boxes}")
+
+        if 'dump_trace' in game_data.triggered_actions and tracer.enabled:
+            tracer.export()
+            self.log.info(f"Wrote trace to {tracer.filename}")
+
     def reset(self, game_data: GameData):
         pass
 
 
 class DebugUISystem(System):
+    main_thread = True
+
     def __init__(self):
-        super().__init__("DebugUI")
+        super().__init__("DebugUI", reads=['text', 'debug_data'], writes=['asset'])
 
     def run(self, game_data: GameData, entity):
         if hasattr(entity, "text"):
@@ -100,14 +149,16 @@ class InputSystem(System):
 class MovementInputSystem(System):
     def __init__(self):
         super().__init__("MovementInput", [
-            'player', 'acceleration', 'rotation', 'velocity'], ['speed'])
+            'player', 'acceleration', 'rotation', 'velocity'], ['speed'],
+                         reads=['player', 'rotation', 'velocity', 'speed', 'movement', 'mouse_movement'],
+                         writes=['rotation', 'acceleration', 'velocity'])
 
     def run(self, game_data: GameData, entity):
         if game_data.show_overview:
             return
 
         if game_data.mouse_movement.x != 0 or game_data.mouse_movement.y != 0:
-            scale_factor = game_data.frame_time * 100 * game_data.sensitivity
+            scale_factor = MOUSE_ROTATION * game_data.sensitivity
             entity.rotation.x -= game_data.mouse_movement.y * scale_factor
             entity.rotation.y += game_data.mouse_movement.x * scale_factor
 
@@ -115,26 +166,7 @@ class MovementInputSystem(System):
         sideways_direction = vec3(-direction.y, 0, direction.x)
         forward_direction = vec3(direction.x, 0, direction.y)
 
-        movement = vec2()
-        for symbol in game_data.key_map:
-            if not game_data.key_map[symbol]:
-                continue
-            if symbol in [pyglet.window.key.W, pyglet.window.key.S]:
-                if symbol == pyglet.window.key.W and movement.y != -1:
-                    movement.y = -1
-                elif symbol == pyglet.window.key.S and movement.y != 1:
-                    movement.y = 1
-                else:
-                    movement.y = 0
-
-            if symbol in [pyglet.window.key.D, pyglet.window.key.A]:
-                if symbol == pyglet.window.key.D and movement.x != -1:
-                    movement.x = -1
-                elif symbol == pyglet.window.key.A and movement.x != 1:
-                    movement.x = 1
-                else:
-                    movement.x = 0
-
+        movement = game_data.movement
         if movement == vec2():
             entity.acceleration = vec3()
             entity.velocity = vec3()
@@ -142,48 +174,63 @@ class MovementInputSystem(System):
 
         forward_direction *= movement.y
         sideways_direction *= movement.x
-        final_direction = forward_direction + sideways_direction
-        entity.acceleration = final_direction * game_data.frame_time
+        final_direction = (forward_direction + sideways_direction).normalize()
+        entity.acceleration = final_direction * ACCELERATION
         if hasattr(entity, 'speed'):
             entity.acceleration *= entity.speed
 
         if entity.velocity == vec3():
-            entity.velocity = final_direction.copy().normalize()
+            entity.velocity = final_direction * START_SPEED
 
 
 class AccelerationSystem(System):
-    def __init__(self):
+    batched = True
+
+    def __init__(self, kinematics: KinematicsStore = None):
         super().__init__("Acceleration", [
-            'velocity', 'acceleration'], ['speed', 'max_speed'])
+            'velocity', 'acceleration'], ['speed', 'max_speed'],
+                         writes=['velocity', 'acceleration'])
+        if kinematics is None:
+            kinematics = KinematicsStore()
+        self.kinematics = kinematics
+
+    def remove(self, entity):
+        if entity in self.kinematics:
+            self.kinematics.remove(entity)
 
     def run(self, game_data: GameData, entity):
-        if entity.velocity.length > 0:
-            drag = entity.velocity.copy().normalize() * -0.5 * game_data.frame_time
-        else:
-            drag = vec3()
+        self.update(game_data, [entity])
 
-        if hasattr(entity, 'speed'):
-            drag *= entity.speed
+    def run_all(self, game_data: GameData, entities: list):
+        start = perf_counter()
+        self.update(game_data, entities)
+        self.timings.add(perf_counter() - start)
 
-        entity.velocity += entity.acceleration + drag
-        if hasattr(entity, 'max_speed'):
-            if entity.velocity.length > entity.max_speed:
-                entity.velocity = entity.velocity.normalize() * entity.max_speed
-        entity.acceleration = vec3()
+    def update(self, game_data: GameData, entities: list):
+        rows = self.kinematics.gather(entities)
+        accelerate(self.kinematics, rows, game_data.frame_time)
+        self.kinematics.invalidate(rows, ['velocity', 'acceleration'])
 
 
 class CollisionSystem(System):
-    def __init__(self):
-        super().__init__("Collision", ['model_matrix', 'bounding_boxes'])
+    def __init__(self, workers: int = 0, world_collider: OccupancyGrid = None):
+        super().__init__("Collision", ['model_matrix', 'bounding_boxes'],
+                         reads=['model_matrix', 'bounding_boxes', 'position', 'rotation', 'scale'],
+                         writes=['contacts'])
         self.loop_counter = 0
         self.collision_counter = 0
+        self.world_collider = world_collider
+
+        self.pool = None
+        if workers > 0:
+            self.pool = NarrowphasePool(workers)
 
     @staticmethod
     def project(box: BoundingBox, normal: vec3):
         min_box = None
         max_box = None
-        for vertex in box.vertices:
-            projection = dot(box.model_matrix * vertex, normal)
+        for vertex in box.world_vertices:
+            projection = dot(vertex, normal)
             if min_box is None or min_box > projection:
                 min_box = projection
             if max_box is None or max_box < projection:
@@ -203,13 +250,12 @@ class CollisionSystem(System):
         return 0
 
     @staticmethod
-    def check_for_overlap(normals: list, rotation_matrix: mat4, box: BoundingBox, other: BoundingBox):
+    def check_for_overlap(axes: list, box: BoundingBox, other: BoundingBox):
         minimum_overlap = None
         overlap_normal = None
-        for normal in normals:
-            normal = (rotation_matrix * normal.copy()).normalize()
-            min_box, max_box = CollisionSystem.project(box, normal)
-            min_other, max_other = CollisionSystem.project(other, normal)
+        for axis in axes:
+            min_box, max_box = CollisionSystem.project(box, axis)
+            min_other, max_other = CollisionSystem.project(other, axis)
             if max_box < min_other and max_box < max_other:
                 return None, None
             elif min_box > min_other and min_box > max_other:
@@ -219,22 +265,26 @@ class CollisionSystem(System):
                     min_box, max_box, min_other, max_other)
                 if minimum_overlap is None or minimum_overlap > overlap:
                     minimum_overlap = overlap
-                    overlap_normal = normal
+                    overlap_normal = axis
 
         return minimum_overlap, overlap_normal
 
     @staticmethod
     def collides(box: BoundingBox, box_rotation_matrix: mat4, other: BoundingBox, other_rotation_matrix: mat4):
-        minimum_overlap, overlap_normal = CollisionSystem.check_for_overlap(box.normals, box_rotation_matrix, box,
-                                                                            other)
-        if minimum_overlap is None or overlap_normal is None:
+        box_overlap, box_normal = CollisionSystem.check_for_overlap(box.rotated_axes(box_rotation_matrix), box,
+                                                                    other)
+        if box_overlap is None or box_normal is None:
             return False, None
 
-        minimum_overlap, overlap_normal = CollisionSystem.check_for_overlap(other.normals, other_rotation_matrix, box,
-                                                                            other)
-        if minimum_overlap is None or overlap_normal is None:
+        other_overlap, other_normal = CollisionSystem.check_for_overlap(other.rotated_axes(other_rotation_matrix),
+                                                                        box, other)
+        if other_overlap is None or other_normal is None:
             return False, None
 
+        if box_overlap <= other_overlap:
+            minimum_overlap, overlap_normal = box_overlap, box_normal
+        else:
+            minimum_overlap, overlap_normal = other_overlap, other_normal
         return True, overlap_normal * (minimum_overlap + 0.000000000000001)
 
     @staticmethod
@@ -243,20 +293,25 @@ class CollisionSystem(System):
             return True
 
         if hasattr(box, 'radius') and hasattr(other_box, 'radius'):
-            box_pos = box.model_matrix * vec3()
-            other_pos = other_box.model_matrix * vec3()
-            diff = box_pos - other_pos
+            diff = box.world_position - other_box.world_position
             if diff.length > box.radius * entity.scale + other_box.radius * other.scale:
                 return True
         return False
 
-    def do_collision_check(self, entity, other, box, other_box):
-        entity_rotation_matrix = identity()
+    @staticmethod
+    def get_rotation_matrix(entity) -> mat4:
+        rotation_matrix = identity()
         if hasattr(entity, 'rotation'):
-            rotate(entity_rotation_matrix, entity.rotation)
-        other_rotation_matrix = identity()
-        if hasattr(other, 'rotation'):
-            rotate(other_rotation_matrix, other.rotation)
+            rotate(rotation_matrix, entity.rotation)
+        return rotation_matrix
+
+    def add_contact(self, game_data: GameData, entity, other, overlap: vec3):
+        game_data.contacts.add(entity.entity_id, overlap)
+        game_data.contacts.add(other.entity_id, overlap * -1)
+
+    def do_collision_check(self, game_data: GameData, entity, other, box, other_box):
+        entity_rotation_matrix = self.get_rotation_matrix(entity)
+        other_rotation_matrix = self.get_rotation_matrix(other)
 
         collides, overlap = self.collides(
             box, entity_rotation_matrix,
@@ -264,8 +319,8 @@ class CollisionSystem(System):
         )
         self.collision_counter += 1
         if collides:
-            dot_entity = dot(box.model_matrix * vec3(), overlap)
-            dot_other = dot(other_box.model_matrix * vec3(), overlap)
+            dot_entity = dot(box.world_position, overlap)
+            dot_other = dot(other_box.world_position, overlap)
             direction = dot_entity - dot_other
             if direction < 0:
                 direction = -1
@@ -274,18 +329,81 @@ class CollisionSystem(System):
             else:
                 direction = 0
             overlap *= direction
+            self.add_contact(game_data, entity, other, overlap)
+
+    def do_batched_collision_check(self, game_data: GameData, candidates: list):
+        """
+        Runs the narrowphase for the candidates of all entities at once on the worker pool.
+        Contacts are added in the same order as the serial check would add them.
+        """
+        rotation_matrices = {}
+        pairs = []
+        for entity, other, box, other_box in candidates:
+            for item in (entity, other):
+                if item not in rotation_matrices:
+                    rotation_matrices[item] = self.get_rotation_matrix(item)
+            pairs.append((box, box.rotated_axes(rotation_matrices[entity]),
+                          other_box, other_box.rotated_axes(rotation_matrices[other])))
+
+        collides, translations = self.pool.run(pack_pairs(pairs))
+        self.collision_counter += len(pairs)
+        for index, (entity, other, _, _) in enumerate(candidates):
+            if collides[index]:
+                overlap = vec3(*map(float, translations[index]))
+                self.add_contact(game_data, entity, other, overlap)
+
+    def do_world_collision_check(self, game_data: GameData, entity):
+        for box in entity.bounding_boxes:
+            if box.type == 'static':
+                continue
 
-            self.log.debug(
-                f"{entity} collides with {other} with an overlap of {overlap}")
+            min_x, _, min_z = box.world_vertex_array.min(axis=0)
+            max_x, _, max_z = box.world_vertex_array.max(axis=0)
 
-            entity.collision = overlap
-            other.collision = overlap * -1
+            self.collision_counter += 1
+            contacts = self.world_collider.collide(float(min_x), float(min_z), float(max_x), float(max_z))
+            for contact in contacts:
+                game_data.contacts.add(entity.entity_id, contact)
 
     def run(self, game_data: GameData, entity):
+        if self.world_collider is not None:
+            self.do_world_collision_check(game_data, entity)
+
+        for other, box, other_box in self.find_candidates(game_data, entity):
+            self.do_collision_check(game_data, entity, other, box, other_box)
+
+    def run_all(self, game_data: GameData, entities: list):
+        """
+        With a worker pool the box pairs of all entities are collected first and checked in one batch
+        """
+        if self.pool is None:
+            super().run_all(game_data, entities)
+            return
+
+        start = perf_counter()
+        candidates = []
+        for entity in entities:
+            if self.world_collider is not None:
+                self.do_world_collision_check(game_data, entity)
+            for other, box, other_box in self.find_candidates(game_data, entity):
+                candidates.append((entity, other, box, other_box))
+
+        if len(candidates) > 0:
+            self.do_batched_collision_check(game_data, candidates)
+        self.timings.add(perf_counter() - start)
+
+    def find_candidates(self, game_data: GameData, entity) -> list:
+        """
+        Returns (other, box, other_box) for all box pairs that survive the broadphase
+        """
+        candidates = []
         for other in game_data.entities.query(entity.position):
             if entity == other or not (hasattr(other, 'model_matrix') and hasattr(other, 'bounding_boxes')):
                 continue
 
+            if self.world_collider is not None and hasattr(other, 'world_geometry'):
+                continue
+
             for box in entity.bounding_boxes:
                 for other_box in other.bounding_boxes:
                     self.loop_counter += 1
@@ -293,29 +411,94 @@ class CollisionSystem(System):
                     if self.no_collision_possible(entity, other, box, other_box):
                         continue
 
-                    self.do_collision_check(entity, other, box, other_box)
+                    candidates.append((other, box, other_box))
+        return candidates
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
 
     def reset(self, game_data: GameData):
-        self.log.debug(
-            f"Looped {self.loop_counter} times and did {self.collision_counter} collision checks")
+        tracer.counter("CollisionLoops", self.loop_counter)
+        tracer.counter("CollisionChecks", self.collision_counter)
         self.loop_counter = 0
         self.collision_counter = 0
+        game_data.contacts.clear()
 
 
 class PositionSystem(System):
-    def __init__(self):
+    batched = True
+
+    def __init__(self, kinematics: KinematicsStore = None):
         super().__init__("Position", ['position', 'model_matrix'], [
-            'velocity', 'rotation', 'scale', 'collision'])
+            'velocity', 'rotation', 'scale'],
+                         reads=['position', 'velocity', 'rotation', 'scale', 'contacts', 'bounding_boxes'],
+                         writes=['position', 'model_matrix', 'bounding_boxes', 'contacts'])
+        if kinematics is None:
+            kinematics = KinematicsStore()
+        self.kinematics = kinematics
+
+    def remove(self, entity):
+        if entity in self.kinematics:
+            self.kinematics.remove(entity)
+
+    def run_all(self, game_data: GameData, entities: list):
+        """
+        Moves all entities with a velocity at once, then updates the transforms one by one
+        """
+        moving = [entity for entity in entities if hasattr(entity, 'velocity')]
+        if len(moving) > 0:
+            start = perf_counter()
+            self.move(game_data, moving)
+            self.timings.add(perf_counter() - start)
+        super().run_all(game_data, entities)
+
+    def move(self, game_data: GameData, entities: list):
+        rows = self.kinematics.gather(entities)
+        for entity in entities:
+            entity.previous_position = entity.position
+        offsets = game_data.contacts.pop(np.array([entity.entity_id for entity in entities], dtype=np.intp))
+        integrate(self.kinematics, rows, game_data.frame_time, offsets)
+        self.kinematics.invalidate(rows, ['position'])
 
     def run(self, game_data: GameData, entity):
-        if hasattr(entity, 'velocity'):
-            if hasattr(entity, 'collision'):
-                entity.position += entity.collision
-                del entity.collision
-            entity.position += entity.velocity
+        transform_key = self.get_transform_key(entity)
+        if transform_key is not None and transform_key == getattr(entity, 'transform_key', None):
+            return
+        entity.transform_key = transform_key
 
-        self.log.debug(f"{entity.position}")
+        self.update_model_matrix(entity, entity.position)
 
+        for bbox in entity.bounding_boxes:
+            m = identity()
+            translate(m, bbox.position)
+            if hasattr(entity, 'scale'):
+                scale(m, entity.scale)
+            translate(m, entity.position)
+            bbox.model_matrix = m
+
+    @staticmethod
+    def get_transform_key(entity):
+        """
+        Snapshot of everything the model matrix depends on. Rotations are modified in place,
+        so the components are copied instead of comparing object identities.
+        """
+        if type(entity.position) != vec3:
+            return None
+
+        key = (entity.position.x, entity.position.y, entity.position.z)
+        if hasattr(entity, 'rotation'):
+            if type(entity.rotation) != vec3:
+                return None
+            key += (entity.rotation.x, entity.rotation.y, entity.rotation.z)
+        if hasattr(entity, 'scale'):
+            if type(entity.scale) == vec3:
+                key += (entity.scale.x, entity.scale.y, entity.scale.z)
+            else:
+                key += (entity.scale,)
+        return key
+
+    def update_model_matrix(self, entity, position: vec3):
         entity.model_matrix = identity()
         if hasattr(entity, 'scale'):
             scale(entity.model_matrix, entity.scale)
@@ -327,30 +510,48 @@ class PositionSystem(System):
                 self.log.error(
                     f"Rotation is not vec3. Could not update model_matrix on {entity}")
 
-        if type(entity.position) == vec3:
-            translate(entity.model_matrix, entity.position)
+        if type(position) == vec3:
+            translate(entity.model_matrix, position)
         else:
             self.log.error(
                 f"Position is not vec3. Could not update model_matrix on {entity}")
 
-        for bbox in entity.bounding_boxes:
-            m = identity()
-            translate(m, bbox.position)
-            if hasattr(entity, 'scale'):
-                scale(m, entity.scale)
-            translate(m, entity.position)
-            bbox.model_matrix = m
+
+class InterpolationSystem(PositionSystem):
+    """
+    Places moving entities between their last two simulated positions, so rendering stays smooth
+    when it runs at a different rate than the simulation
+    """
+    batched = False
+
+    def __init__(self):
+        System.__init__(self, "Interpolation", ['position', 'velocity', 'model_matrix'], ['rotation', 'scale'],
+                        reads=['position', 'previous_position', 'rotation', 'scale', 'interpolation'],
+                        writes=['model_matrix'])
+
+    run_all = System.run_all
+
+    @staticmethod
+    def interpolated_position(game_data: GameData, entity) -> vec3:
+        previous_position = getattr(entity, 'previous_position', entity.position)
+        return previous_position + (entity.position - previous_position) * game_data.interpolation
+
+    def run(self, game_data: GameData, entity):
+        self.update_model_matrix(entity, self.interpolated_position(game_data, entity))
 
 
 class RenderSystem(System):
+    main_thread = True
+
     def __init__(self):
-        super().__init__("Render", ['asset'])
+        super().__init__("Render", ['asset'], reads=['asset', 'model_matrix', 'lights', 'wireframe'],
+                         writes=['asset'])
         self.render_calls = 0
         self.vertex_count = 0
 
     def reset(self, game_data: GameData):
-        self.log.debug(
-            f"{self.render_calls} render calls with {self.vertex_count} vertices")
+        tracer.counter("RenderCalls", self.render_calls)
+        tracer.counter("Vertices", self.vertex_count)
         self.render_calls = 0
         self.vertex_count = 0
 
@@ -406,36 +607,53 @@ class RenderSystem(System):
     def bind_uniforms(self, entity, game_data):
         for uniform_name in entity.asset.uniforms:
             data_name = entity.asset.uniforms[uniform_name]
-            mapping = f"{uniform_name}=>{data_name}"
             if type(data_name) != str:
-                self.log.debug(f"Found {mapping} in uniforms")
                 # read data directly from uniforms
                 data = data_name
                 entity.asset.shader.uniform(uniform_name, data)
             elif hasattr(entity.asset, data_name):
-                self.log.debug(f"Found {mapping} in asset")
                 entity.asset.shader.uniform(
                     uniform_name, getattr(entity.asset, data_name))
             elif hasattr(entity, data_name):
-                self.log.debug(f"Found {mapping} in entity")
                 entity.asset.shader.uniform(
                     uniform_name, getattr(entity, data_name))
             elif hasattr(game_data, data_name):
-                self.log.debug(f"Found {mapping} in game_data")
                 entity.asset.shader.uniform(
                     uniform_name, getattr(game_data, data_name))
             else:
-                self.log.warning(f"Could not find any data for {mapping}")
+                self.log.warning(f"Could not find any data for {uniform_name}=>{data_name}")
 
 
 class BoundingBoxRenderSystem(System):
+    main_thread = True
+
     def __init__(self):
-        super().__init__("BoundingBoxRender", ['bounding_boxes'])
+        super().__init__("BoundingBoxRender", ['bounding_boxes'],
+                         reads=['bounding_boxes', 'position', 'scale', 'collision_boxes'])
+        self.shader = None
+        self.models = {}
 
     def run(self, game_data: GameData, entity):
-        if not game_data.collision_boxes:
+        if not game_data.collision_boxes or len(entity.bounding_boxes) == 0:
+            return
+
+        if self.shader is None:
+            self.shader = Shader("shaders/bb_vertex.glsl", "shaders/bb_fragment.glsl")
+
+        if entity not in self.models:
+            self.models[entity] = bounding_box_model(entity, self.shader)
+
+        model = self.models[entity]
+        update_bounding_box_model(model, entity)
+        game_data.systems['render'].run(game_data, model)
+
+    def reset(self, game_data: GameData):
+        if game_data.collision_boxes or self.shader is None:
             return
 
-        for bb in entity.bounding_boxes:
-            if hasattr(bb, 'asset'):
-                game_data.systems['render'].run(game_data, bb)
+        for model in self.models.values():
+            release(model.asset)
+        self.models = {}
+        self.shader.delete()
+        self.shader = None
+        self.log.info("Released bounding box assets")
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from time import perf_counter_ns
+
+import numpy as np
+
+BEGIN = 0
+END = 1
+COUNTER = 2
+PHASES = ['B', 'E', 'C']
+
+
+class Span:
+    __slots__ = ['tracer', 'name']
+
+    def __init__(self, tracer, name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.tracer.begin(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer.end(self.name)
+
+
+class NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NO_SPAN = NoSpan()
+
+
+class Tracer:
+    """
+    Records spans and counters into a preallocated ring buffer, the oldest events are overwritten.
+    Names are only stored once, so recording an event never formats a string.
+    When the tracer is disabled every call returns right away.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.enabled = False
+        self.filename = None
+        self.capacity = capacity
+
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.phases = np.zeros(capacity, dtype=np.int8)
+        self.name_ids = np.zeros(capacity, dtype=np.int32)
+        self.values = np.zeros(capacity)
+        self.thread_ids = np.zeros(capacity, dtype=np.int64)
+
+        self.names = []
+        self.name_ids_by_name = {}
+        self.names_lock = threading.Lock()
+        # number of events that were recorded, threads take their slot under the lock
+        self.count = 0
+        self.count_lock = threading.Lock()
+
+    def start(self, filename: str = None):
+        self.filename = filename
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def name_id(self, name: str) -> int:
+        name_id = self.name_ids_by_name.get(name)
+        if name_id is None:
+            with self.names_lock:
+                name_id = self.name_ids_by_name.setdefault(name, len(self.names))
+                if name_id == len(self.names):
+                    self.names.append(name)
+        return name_id
+
+    def record(self, phase: int, name: str, value: float = 0.0):
+        with self.count_lock:
+            position = self.count % self.capacity
+            self.count += 1
+        self.timestamps[position] = perf_counter_ns()
+        self.phases[position] = phase
+        self.name_ids[position] = self.name_id(name)
+        self.values[position] = value
+        self.thread_ids[position] = threading.get_ident()
+
+    def begin(self, name: str):
+        if self.enabled:
+            self.record(BEGIN, name)
+
+    def end(self, name: str):
+        if self.enabled:
+            self.record(END, name)
+
+    def counter(self, name: str, value: float):
+        if self.enabled:
+            self.record(COUNTER, name, value)
+
+    def span(self, name: str):
+        if self.enabled:
+            return Span(self, name)
+        return NO_SPAN
+
+    def events(self) -> list:
+        """
+        Returns the buffered events in Chrome trace format, oldest first
+        """
+        with self.count_lock:
+            end = self.count
+        positions = np.arange(max(0, end - self.capacity), end) % self.capacity
+
+        pid = os.getpid()
+        events = []
+        for position in positions.tolist():
+            phase = PHASES[self.phases[position]]
+            name = self.names[self.name_ids[position]]
+            event = {
+                'name': name,
+                'ph': phase,
+                'ts': int(self.timestamps[position]) / 1000,
+                'pid': pid,
+                'tid': int(self.thread_ids[position]),
+            }
+            if phase == 'C':
+                event['args'] = {name: float(self.values[position])}
+            events.append(event)
+        return events
+
+    def export(self, filename: str = None):
+        """
+        Writes the buffered events as a Chrome trace, which can be opened in chrome://tracing or Perfetto
+        """
+        if filename is None:
+            filename = self.filename
+        with open(filename, "w") as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f)
+
+
+tracer = Tracer()
@@ -0,0 +1,153 @@
+import atexit
+import math
+import random
+from datetime import datetime
+
+import pyglet
+from pyglet.gl import glEnable, GL_DEPTH_TEST, GL_BLEND, glBlendFunc, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA
+from pyglet.gl import glClearColor, glViewport
+
+import run_n_jump.game as game
+import run_n_jump.hot_reload as hot_reload
+from .math_helper import identity, mat4, vec2
+from .frame_statistics import FrameStatistics
+from .game_data import GameData
+from .input_state import InputState
+from .recording import InputRecorder
+
+MODULE_WHITELIST = ['game']
+FRAME_RATE = 120
+
+
+class Window(pyglet.window.Window):
+    def __init__(self, width, height, resizable: bool = False, grid_collision: bool = False, seed: int = None,
+                 record: str = None, workers: int = 0, frame_statistics: str = None, loader_processes: int = 0,
+                 collision_workers: int = 0):
+        super(Window, self).__init__(width, height, resizable=resizable)
+
+        glEnable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glClearColor(0, 0, 0, 1)
+
+        # glEnable(GL_CULL_FACE)
+
+        self.start_time = datetime.now()
+        self.frame_start_time = datetime.now()
+        self.frame_statistics = FrameStatistics()
+        if frame_statistics is not None:
+            atexit.register(self.frame_statistics.export_csv, frame_statistics)
+
+        self.projection_matrix = identity()
+        self.input = InputState()
+        if record is not None and seed is None:
+            # a replay needs the seed of the recorded run
+            seed = random.randrange(2 ** 32)
+        self.game = game.Game(grid_collision=grid_collision, seed=seed, workers=workers,
+                              frame_target=1 / FRAME_RATE, loader_processes=loader_processes,
+                              collision_workers=collision_workers)
+        atexit.register(self.game.close)
+        self.game_data = GameData()
+
+        self.recorder = None
+        if record is not None:
+            self.recorder = InputRecorder(seed, grid_collision)
+            # the game exits directly on escape, so the recording is saved when the interpreter shuts down
+            atexit.register(self.recorder.save, record)
+
+    def show_frame_statistics(self):
+        end = datetime.now()
+        if (end - self.start_time).total_seconds() > 1:
+            summary = self.frame_statistics.summary()
+            self.set_caption(f"Run'n'Jump p50={summary['p50']:.2f}ms p99={summary['p99']:.2f}ms "
+                             f"max={summary['max']:.2f}ms hitches={summary['hitches']}")
+            self.start_time = end
+
+    def on_draw(self, *args):
+        self.frame_statistics.frame()
+        end = datetime.now()
+        frame_time = (end - self.frame_start_time).total_seconds()
+        self.frame_start_time = datetime.now()
+
+        # hot_reload.reload_all(MODULE_WHITELIST)
+
+        self.clear()
+
+        self.game_data.frame_time = frame_time
+        self.game_data.screen_dimensions = vec2(self.width, self.height)
+        self.game_data.projection_matrix = self.projection_matrix
+        self.input.update(self.game_data)
+        self.frame_statistics.publish(self.game_data.debug_data)
+        self.set_exclusive_mouse(not self.game_data.show_overview)
+        show_overview_before = self.game_data.show_overview
+
+        if self.recorder is not None:
+            self.recorder.record(self.game_data)
+
+        self.game.tick(self.game_data)
+
+        if self.recorder is not None:
+            self.recorder.record_labyrinth_blocks(self.game.loaded_blocks)
+
+        if show_overview_before != self.game_data.show_overview:
+            self.on_resize(self.width, self.height)
+
+        self.show_frame_statistics()
+
+    def on_resize(self, width, height):
+        glViewport(0, 0, width, height)
+
+        if self.game_data.show_overview:
+            self.orthographic_projection(width, height)
+        else:
+            self.perspective_projection(width, height)
+
+    def orthographic_projection(self, width, height):
+        z_near = 1
+        z_far = 500
+        temp1 = -2 / (z_far - z_near)
+        temp2 = -1 * (z_far + z_near) / (z_far - z_near)
+        self.projection_matrix = mat4([
+            [2 / width, 0, 0, 0],
+            [0, 2 / height, 0, 0],
+            [0, 0, temp1, temp2],
+            [0, 0, 0, 1],
+        ])
+
+    def perspective_projection(self, width, height):
+        aspect_ratio = width / height
+        fovy = 75
+        z_near = 1
+        z_far = 1000
+        f = 1 / (math.tan(fovy * math.pi / 360))
+        temp1 = (z_far + z_near) / (z_near - z_far)
+        temp2 = (2 * z_far * z_near) / (z_near - z_far)
+        self.projection_matrix = mat4([
+            [f / aspect_ratio, 0, 0, 0],
+            [0, f, 0, 0],
+            [0, 0, temp1, temp2],
+            [0, 0, -1, 0],
+        ])
+
+    def on_key_press(self, symbol, modifiers):
+        self.input.key_event(symbol, True)
+        self.game.handle_key(symbol, modifiers, True)
+
+    def on_key_release(self, symbol, modifiers):
+        self.input.key_event(symbol, False)
+        self.game.handle_key(symbol, modifiers, False)
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        self.input.mouse_motion(x, y, dx, dy)
+
+
+def run_window(grid_collision: bool = False, seed: int = None, record: str = None, workers: int = 0,
+               frame_statistics: str = None, loader_processes: int = 0, collision_workers: int = 0):
+    window = Window(width=1280, height=720, resizable=True, grid_collision=grid_collision, seed=seed,
+                    record=record, workers=workers, frame_statistics=frame_statistics,
+                    loader_processes=loader_processes, collision_workers=collision_workers)
+    window.set_caption("Run'n'Jump")
+
+    pyglet.clock.schedule_interval(window.on_draw, 1 / FRAME_RATE)
+    pyglet.clock.set_fps_limit(FRAME_RATE)
+    pyglet.app.run()
@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+
+from batch import BatchSimulation
+from camera import Camera
+from grid_collision import OccupancyGrid
+from math_helper import vec2, vec3
+
+
+class BatchSimulationTest(unittest.TestCase):
+    def create_simulation(self, count: int) -> BatchSimulation:
+        solid = np.zeros((4, 4), dtype=bool)
+        solid[:, 3] = True
+        return BatchSimulation(count, OccupancyGrid(solid, 5), Camera(vec3(10, 0, 10), vec2(0, 0)))
+
+    def test_worlds_are_independent(self):
+        simulation = self.create_simulation(2)
+        movement = np.array([[0, -1], [0, 0]], dtype=float)
+        for _ in range(10):
+            simulation.step(1 / 120, movement, np.zeros((2, 2)))
+        self.assertGreater(np.linalg.norm(simulation.position[0] - [10, 0, 10]), 0)
+        self.assertEqual([10, 0, 10], simulation.position[1].tolist())
+        self.assertEqual([0, 0, 0], simulation.velocity[1].tolist())
+
+    def test_walls_stop_the_player(self):
+        simulation = self.create_simulation(1)
+        # facing along z, moving to the left walks along x into the wall at x=15
+        movement = np.array([[-1, 0]], dtype=float)
+        for _ in range(200):
+            simulation.step(1 / 120, movement, np.zeros((1, 2)))
+        self.assertLessEqual(simulation.position[0, 0] + simulation.box_max[0], 15 + 0.25)
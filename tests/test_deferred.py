@@ -0,0 +1,69 @@
+import unittest
+
+from deferred import DeferredTasks, Task
+from game_data import GameData
+
+
+class DeferredTasksTest(unittest.TestCase):
+    def setUp(self):
+        self.game_data = GameData()
+        self.order = []
+
+    def record(self, name, result=True):
+        return lambda game_data: self.order.append(name) or result
+
+    def test_runs_by_priority(self):
+        tasks = DeferredTasks()
+        tasks.add(Task("low", self.record("low"), priority=2, interval=1))
+        tasks.add(Task("high", self.record("high"), priority=0, interval=1))
+        tasks.add(Task("medium", self.record("medium"), priority=1, interval=1))
+        self.assertEqual(3, tasks.run(self.game_data, 0))
+        self.assertEqual(["high", "medium", "low"], self.order)
+
+    def test_only_overdue_tasks_run_without_time(self):
+        tasks = DeferredTasks()
+        tasks.add(Task("waiting", self.record("waiting"), interval=1))
+        tasks.add(Task("overdue", self.record("overdue"), priority=1, interval=1, max_delay=2))
+        self.assertEqual(0, tasks.run(self.game_data, 1, budget=0))
+        self.assertEqual(1, tasks.run(self.game_data, 2, budget=0))
+        self.assertEqual(["overdue"], self.order)
+
+    def test_interval(self):
+        tasks = DeferredTasks()
+        tasks.add(Task("every_other", self.record("every_other"), interval=2))
+        for frame in range(5):
+            tasks.run(self.game_data, frame)
+        self.assertEqual(3, len(self.order))
+
+    def test_zero_interval_runs_until_done(self):
+        remaining = [3]
+
+        def countdown(game_data):
+            remaining[0] -= 1
+            return remaining[0] > 0
+
+        tasks = DeferredTasks()
+        tasks.add(Task("countdown", countdown))
+        self.assertEqual(3, tasks.run(self.game_data, 0))
+        self.assertEqual(0, len(tasks))
+
+    def test_waits_until_ready(self):
+        ready = [False]
+        tasks = DeferredTasks()
+        tasks.add(Task("waiting", self.record("waiting"), max_delay=0, ready=lambda: ready[0]))
+        self.assertEqual(0, tasks.run(self.game_data, 0))
+        ready[0] = True
+        tasks.run(self.game_data, 1, budget=0)
+        self.assertEqual(["waiting"], self.order)
+
+    def test_removes_finished_tasks(self):
+        tasks = DeferredTasks()
+        tasks.add(Task("once", self.record("once", False), interval=1))
+        tasks.run(self.game_data, 0)
+        tasks.run(self.game_data, 1)
+        self.assertEqual(["once"], self.order)
+        self.assertEqual(0, len(tasks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+from frame_statistics import FrameStatistics, NS_PER_MS
+
+
+class FrameStatisticsTest(unittest.TestCase):
+    path = "test_frame_statistics.csv"
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_empty_summary(self):
+        self.assertEqual(0.0, FrameStatistics().summary()['p99'])
+
+    def test_summary(self):
+        statistics = FrameStatistics(window_size=100, bin_width_ms=1)
+        for _ in range(98):
+            statistics.add(int(10.5 * NS_PER_MS))
+        statistics.add(30 * NS_PER_MS)
+        statistics.add(500 * NS_PER_MS)
+
+        summary = statistics.summary()
+        self.assertEqual(11.0, summary['p50'])
+        self.assertEqual(11.0, summary['p95'])
+        self.assertEqual(31.0, summary['p99'])
+        self.assertEqual(500.0, summary['max'])
+        self.assertEqual(2, summary['hitches'])
+        self.assertAlmostEqual(15.59, summary['mean'])
+
+    def test_window_rolls(self):
+        statistics = FrameStatistics(window_size=3, bin_width_ms=1)
+        for duration in [50, 1, 2, 3]:
+            statistics.add(duration * NS_PER_MS)
+        self.assertEqual([1, 2, 3], (statistics.window() // NS_PER_MS).tolist())
+        self.assertEqual(3, int(statistics.histogram.sum()))
+        self.assertEqual(3.0, statistics.summary()['max'])
+        self.assertEqual(3.0, statistics.summary()['p99'])
+
+    def test_export_csv(self):
+        statistics = FrameStatistics(window_size=2)
+        for duration in [4, 5, 6]:
+            statistics.add(duration * NS_PER_MS)
+        statistics.export_csv(self.path)
+        with open(self.path) as f:
+            self.assertEqual(["frame,frame_time_ms", "1,5.0", "2,6.0"], f.read().splitlines())
@@ -0,0 +1,31 @@
+import unittest
+
+from game import Game
+from game_data import GameData
+from input_state import movement_axes
+from math_helper import vec2
+
+
+def move_right(simulation_rate: int, frame_time: float, frames: int) -> float:
+    game = Game(simulation_rate=simulation_rate, headless=True, seed=1, load_labyrinth=False)
+    game_data = GameData(screen_dimensions=vec2(1280, 720))
+    game_data.frame_time = frame_time
+    game_data.movement = movement_axes(frozenset(['move_right']))
+    start = game.camera.position.copy()
+    for _ in range(frames):
+        game.tick(game_data)
+    game.close()
+    return (game.camera.position - start).length
+
+
+class GameTest(unittest.TestCase):
+    def test_simulation_rate_does_not_change_speed(self):
+        # the frame time is a multiple of both steps, so both simulations run for exactly half a second
+        fast = move_right(128, 1 / 32, 16)
+        slow = move_right(32, 1 / 32, 16)
+        self.assertAlmostEqual(15, fast)
+        self.assertAlmostEqual(fast, slow)
+
+
+if __name__ == '__main__':
+    unittest.main()
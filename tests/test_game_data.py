@@ -0,0 +1,17 @@
+import unittest
+
+from game_data import GameData
+
+
+class GameDataTest(unittest.TestCase):
+    def test_instances_do_not_share_state(self):
+        first = GameData()
+        second = GameData()
+        first.lights.append({})
+        first.debug_data['total_time'] = 1.0
+        self.assertEqual([], second.lights)
+        self.assertEqual({}, second.debug_data)
+
+    def test_unknown_attributes_are_rejected(self):
+        with self.assertRaises(AttributeError):
+            GameData().key_map = {}
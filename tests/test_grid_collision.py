@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from grid_collision import OccupancyGrid, create_occupancy_grid
+from math_helper import vec3
+from pool import ContactBuffer
+
+
+class OccupancyGridTest(unittest.TestCase):
+    def create_grid(self):
+        image = np.array([
+            [255, 255, 255, 255],
+            [255, 0, 0, 255],
+            [255, 255, 0, 255],
+            [255, 255, 255, 255],
+        ])
+        return create_occupancy_grid(image, 2)
+
+    def test_is_solid(self):
+        grid = self.create_grid()
+        self.assertFalse(grid.is_solid(0, 0))
+        self.assertTrue(grid.is_solid(1, 1))
+        self.assertTrue(grid.is_solid(-1, 0))
+        self.assertTrue(grid.is_solid(0, 4))
+
+    def test_no_contacts_in_free_space(self):
+        grid = self.create_grid()
+        self.assertEqual([], grid.collide(0.5, 0.5, 1.5, 1.5))
+        self.assertEqual([], grid.collide(1, 1, 2, 2))
+
+    def test_push_out_of_single_wall(self):
+        grid = self.create_grid()
+        contacts = grid.collide(1.5, 2.5, 2.5, 3.5)
+        self.assertEqual([vec3(-0.5, 0, 0)], contacts)
+
+    def test_no_push_into_neighbor_cell(self):
+        grid = self.create_grid()
+        contacts = grid.collide(3, 1.75, 5, 2.5)
+        self.assertEqual([vec3(0, 0, -0.5), vec3(0, 0, -0.5)], contacts)
+
+    def test_out_of_bounds_is_solid(self):
+        grid = OccupancyGrid(np.zeros((1, 1), dtype=bool), 1)
+        self.assertEqual([vec3(-0.5, 0, 0)], grid.collide(0.5, 0.25, 1.5, 0.75))
+
+    def test_collide_all(self):
+        grid = self.create_grid()
+        rectangles = np.array([
+            [0.5, 0.5, 1.5, 1.5],
+            [1.5, 2.5, 2.5, 3.5],
+            [3, 1.75, 5, 2.5],
+            [2.5, 2.5, 5.5, 5.5],
+            [-1, -1, 9, 9],
+        ])
+        contacts = ContactBuffer()
+        for index, rectangle in enumerate(rectangles.tolist()):
+            for contact in grid.collide(*rectangle):
+                contacts.add(index, contact)
+        expected = contacts.resolve(np.arange(len(rectangles)))
+        self.assertEqual(expected.tolist(), grid.collide_all(*rectangles.T).tolist())
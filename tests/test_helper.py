@@ -0,0 +1,26 @@
+import unittest
+
+from helper import CallTimings
+
+
+class CallTimingsTest(unittest.TestCase):
+    def test_empty_summary(self):
+        timings = CallTimings()
+        self.assertEqual({'count': 0, 'total': 0.0, 'min': 0.0, 'max': 0.0, 'p95': 0.0}, timings.summary())
+
+    def test_summary(self):
+        timings = CallTimings()
+        for duration in range(20, 0, -1):
+            timings.add(duration / 1000)
+        summary = timings.summary()
+        self.assertEqual(20, summary['count'])
+        self.assertAlmostEqual(210, summary['total'])
+        self.assertAlmostEqual(1, summary['min'])
+        self.assertAlmostEqual(20, summary['max'])
+        self.assertAlmostEqual(19, summary['p95'])
+
+    def test_clear(self):
+        timings = CallTimings()
+        timings.add(1)
+        timings.clear()
+        self.assertEqual(0, timings.summary()['count'])
@@ -0,0 +1,54 @@
+import unittest
+
+from game_data import GameData
+from input_state import InputState, movement_axes
+from math_helper import vec2
+
+FORWARD = 1
+BACKWARD = 2
+TOGGLE = 3
+
+
+class InputStateTest(unittest.TestCase):
+    def setUp(self):
+        self.input = InputState({FORWARD: 'move_forward', BACKWARD: 'move_backward', TOGGLE: 'toggle_wireframe'})
+        self.game_data = GameData()
+
+    def test_movement_axes(self):
+        self.assertEqual(vec2(1, -1), movement_axes({'move_forward', 'move_left'}))
+        self.assertEqual(vec2(0, 0), movement_axes({'move_forward', 'move_backward'}))
+
+    def test_held_actions(self):
+        self.input.key_event(FORWARD, True)
+        self.input.update(self.game_data)
+        self.assertEqual(frozenset(['move_forward']), self.game_data.actions)
+        self.assertEqual(vec2(0, -1), self.game_data.movement)
+
+        self.input.update(self.game_data)
+        self.assertEqual(frozenset(['move_forward']), self.game_data.actions)
+        self.assertEqual(frozenset(), self.game_data.triggered_actions)
+
+        self.input.key_event(FORWARD, False)
+        self.input.update(self.game_data)
+        self.assertEqual(frozenset(), self.game_data.actions)
+
+    def test_short_press_is_not_lost(self):
+        self.input.key_event(TOGGLE, True)
+        self.input.key_event(TOGGLE, False)
+        self.input.key_event(42, True)
+        self.input.update(self.game_data)
+        self.assertEqual(frozenset(['toggle_wireframe']), self.game_data.triggered_actions)
+        self.assertEqual(frozenset(['toggle_wireframe']), self.game_data.actions)
+
+        self.input.update(self.game_data)
+        self.assertEqual(frozenset(), self.game_data.actions)
+
+    def test_mouse_movement_is_accumulated(self):
+        self.input.mouse_motion(10, 10, 2, 1)
+        self.input.mouse_motion(12, 11, 3, -4)
+        self.input.update(self.game_data)
+        self.assertEqual(vec2(5, -3), self.game_data.mouse_movement)
+        self.assertEqual(vec2(12, 11), self.game_data.mouse_position)
+
+        self.input.update(self.game_data)
+        self.assertEqual(vec2(), self.game_data.mouse_movement)
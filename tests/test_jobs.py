@@ -0,0 +1,37 @@
+import threading
+import unittest
+
+from jobs import JobSystem
+
+
+class JobSystemTest(unittest.TestCase):
+    def test_runs_inline_without_workers(self):
+        jobs = JobSystem()
+        job = jobs.submit(threading.current_thread)
+        self.assertTrue(job.done())
+        self.assertIs(threading.current_thread(), job.result())
+
+    def test_inline_exceptions(self):
+        jobs = JobSystem()
+        job = jobs.submit(int, "not a number")
+        with self.assertRaises(ValueError):
+            job.result()
+
+    def test_shutdown_stops_workers(self):
+        jobs = JobSystem(2)
+        jobs.submit(threading.current_thread).result()
+        jobs.shutdown()
+        self.assertFalse(any(thread.name.startswith("job") for thread in threading.enumerate()))
+        self.assertEqual(1, jobs.submit(int, "1").result())
+        jobs.shutdown()
+
+    def test_submit_after(self):
+        jobs = JobSystem(2)
+        order = []
+        event = threading.Event()
+        first = jobs.submit(lambda: event.wait(1) and order.append("first"))
+        second = jobs.submit_after([first], order.append, "second")
+        event.set()
+        second.result()
+        jobs.shutdown()
+        self.assertEqual(["first", "second"], order)
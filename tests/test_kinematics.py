@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+
+from kinematics import Kinematic, KinematicsStore, accelerate, integrate
+from math_helper import vec3
+from registry import EntityRegistry
+from systems import PositionSystem
+
+
+class Entity(Kinematic):
+    def __init__(self, position: vec3, velocity: vec3, acceleration: vec3 = None):
+        self.position = position
+        self.velocity = velocity
+        self.acceleration = acceleration if acceleration is not None else vec3()
+
+
+class KinematicsStoreTest(unittest.TestCase):
+    def test_gather_and_invalidate(self):
+        store = KinematicsStore(capacity=1)
+        first = Entity(vec3(1, 2, 3), vec3(1))
+        second = Entity(vec3(), vec3(0, 0, 2))
+        rows = store.gather([first, second])
+        self.assertEqual([0, 1], rows.tolist())
+        self.assertEqual([0, 0, 2], store.velocity[1].tolist())
+
+        position = first.position
+        integrate(store, rows, 0.5)
+        self.assertIs(position, first.position)
+        store.invalidate(rows, ['position'])
+        self.assertEqual(vec3(1.5, 2, 3), first.position)
+        self.assertEqual(vec3(0, 0, 1), second.position)
+        self.assertEqual(vec3(1, 2, 3), position)
+
+    def test_replaced_attributes_are_read_again(self):
+        store = KinematicsStore()
+        entity = Entity(vec3(), vec3(1))
+        store.gather([entity])
+        entity.velocity = vec3(0, 3)
+        rows = store.gather([entity])
+        self.assertEqual([0, 3, 0], store.velocity[rows[0]].tolist())
+
+    def test_remove(self):
+        store = KinematicsStore()
+        first = Entity(vec3(1), vec3())
+        second = Entity(vec3(2), vec3())
+        store.gather([first, second])
+        rows = store.gather([first, second])
+        integrate(store, rows, 1.0, np.ones((2, 3)))
+        store.invalidate(rows, ['position'])
+
+        store.remove(first)
+        self.assertEqual(1, len(store))
+        self.assertEqual(0, store.rows[second])
+        self.assertEqual([3, 1, 1], store.position[0].tolist())
+        self.assertEqual(vec3(2, 1, 1), first.position)
+        first.position = vec3(5)
+        self.assertEqual([3, 1, 1], store.position[0].tolist())
+        self.assertEqual(vec3(3, 1, 1), second.position)
+
+    def test_missing_attributes(self):
+        store = KinematicsStore()
+        entity = Entity(vec3(), vec3())
+        del entity.acceleration
+        store.gather([entity])
+        self.assertFalse(hasattr(entity, 'acceleration'))
+        self.assertFalse(hasattr(entity, 'speed'))
+        self.assertEqual(1, store.speed[0])
+
+    def test_requires_kinematic_entities(self):
+        class Plain:
+            position = vec3()
+            velocity = vec3()
+
+        with self.assertRaises(TypeError):
+            KinematicsStore().gather([Plain()])
+
+    def test_registry_removes_rows(self):
+        system = PositionSystem()
+        registry = EntityRegistry({'position': system})
+        entity = Entity(vec3(), vec3(1))
+        entity.model_matrix = None
+        entity.systems = ['position']
+        registry.add(entity)
+        system.kinematics.gather([entity])
+        registry.remove(entity)
+        self.assertEqual(0, len(system.kinematics))
+
+    def test_accelerate_clamps_to_max_speed(self):
+        store = KinematicsStore()
+        entity = Entity(vec3(), vec3(), vec3(3, 0, 4))
+        entity.max_speed = 1.0
+        rows = store.gather([entity])
+        accelerate(store, rows, 1.0)
+        np.testing.assert_allclose([0.6, 0, 0.8], store.velocity[0])
+        self.assertEqual([0, 0, 0], store.acceleration[0].tolist())
+
+    def test_accelerate_applies_drag(self):
+        store = KinematicsStore()
+        entity = Entity(vec3(), vec3(2))
+        entity.speed = 2
+        rows = store.gather([entity])
+        accelerate(store, rows, 1 / 240)
+        np.testing.assert_allclose([1.5, 0, 0], store.velocity[0])
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from labyrinth import LabyrinthLoader, generate_blocks, labyrinth, mark_edges
+
+
+def create_map():
+    arr = np.zeros((20, 20))
+    arr[2:18, 2:5] = 255
+    arr[2:5, 2:18] = 255
+    arr[10:18, 10:18] = 255
+    return mark_edges(arr)
+
+
+def summarize(block):
+    row, col, block_size, vertices, normals, indices, bounding_boxes = block
+    return row, col, vertices, normals, [box.position for box in bounding_boxes]
+
+
+def load_all(loader: LabyrinthLoader):
+    blocks = []
+    while True:
+        try:
+            blocks.append(summarize(loader.next_block()))
+        except StopIteration:
+            return blocks
+
+
+class MarkEdgesTest(unittest.TestCase):
+    def test_marks_pixels_next_to_walls(self):
+        arr = np.full((5, 6), 255.0)
+        arr[2, 3] = 0
+        expected = np.array([
+            [128, 128, 128, 128, 128, 128],
+            [128, 255, 128, 128, 128, 128],
+            [128, 255, 128, 0, 128, 128],
+            [128, 255, 128, 128, 128, 128],
+            [128, 128, 128, 128, 128, 128],
+        ])
+        np.testing.assert_array_equal(expected, mark_edges(arr))
+
+    def test_ignores_other_values(self):
+        arr = np.full((3, 3), 255.0)
+        arr[0, 0] = 100
+        expected = np.array([
+            [100, 128, 128],
+            [128, 255, 128],
+            [128, 128, 128],
+        ])
+        np.testing.assert_array_equal(expected, mark_edges(arr))
+
+
+class LabyrinthLoaderTest(unittest.TestCase):
+    def test_background_loading(self):
+        expected = load_all(LabyrinthLoader(create_map(), background=False))
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(expected, load_all(LabyrinthLoader(create_map())))
+
+    def test_end_of_blocks(self):
+        loader = LabyrinthLoader(create_map())
+        load_all(loader)
+        self.assertTrue(loader.ready())
+        with self.assertRaises(StopIteration):
+            loader.next_block()
+
+    def test_close_stops_loading(self):
+        loader = LabyrinthLoader(np.tile(create_map(), (10, 10)), processes=2)
+        loader.next_block()
+        loader.close()
+        self.assertFalse(loader.thread.is_alive())
+
+
+class GenerateBlocksTest(unittest.TestCase):
+    def test_same_blocks_as_labyrinth(self):
+        progress = []
+        blocks = generate_blocks(create_map(), processes=2, progress=lambda done, total: progress.append((done, total)))
+        blocks = sorted(map(summarize, blocks), key=lambda block: block[:2])
+        self.assertEqual([summarize(block) for block in labyrinth(create_map())], blocks)
+        self.assertEqual((4, 4), progress[-1])
+
+    def test_close_cancels_remaining_blocks(self):
+        progress = []
+        blocks = generate_blocks(np.tile(create_map(), (10, 10)), processes=2,
+                                 progress=lambda done, total: progress.append((done, total)))
+        next(blocks)
+        blocks.close()
+        self.assertLess(progress[-1][0], progress[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import logging
+import unittest
+
+from logging_config import parse_levels, get_level
+
+
+class LoggingConfigTest(unittest.TestCase):
+    def test_parse_levels(self):
+        levels = parse_levels("warning, Collision=DEBUG,run_n_jump.game=INFO")
+        self.assertEqual({
+            None: logging.WARNING,
+            'Collision': logging.DEBUG,
+            'run_n_jump.game': logging.INFO,
+        }, levels)
+
+    def test_unknown_levels_are_skipped(self):
+        with self.assertWarns(UserWarning):
+            levels = parse_levels("Collision=DEBG,run_n_jump=15,VERBOSE")
+        self.assertEqual({'run_n_jump': 15}, levels)
+
+    def test_get_level(self):
+        levels = parse_levels("ERROR,run_n_jump=DEBUG")
+        self.assertEqual(logging.DEBUG, get_level("run_n_jump.game", levels))
+        self.assertEqual(logging.ERROR, get_level("Collision", levels))
+        self.assertEqual(logging.INFO, get_level("Collision", {}))
@@ -1,7 +1,8 @@
 import os
 import unittest
 
-from model import load_blender_file
+from math_helper import vec3, identity, rotate, translate
+from model import load_blender_file, BoundingBox, unique_axes
 
 
 class ModelTest(unittest.TestCase):
@@ -48,3 +49,40 @@ class ModelTest(unittest.TestCase):
     def test_load_model(self):
         model = load_blender_file(self.path)
         self.assertIsNotNone(model)
+
+
+class BoundingBoxTest(unittest.TestCase):
+    def test_unique_axes(self):
+        normals = [vec3(1), vec3(-1), vec3(0, 2), vec3(0, -1), vec3(0, 0, 1), vec3(0, 0, -1)]
+        self.assertEqual([vec3(1), vec3(0, 1), vec3(0, 0, 1)], unique_axes(normals))
+
+    def test_unique_axes_ignores_zero_normals(self):
+        self.assertEqual([vec3(1)], unique_axes([vec3(), vec3(-3)]))
+
+    def test_axes_update_with_normals(self):
+        box = BoundingBox()
+        self.assertEqual([], box.axes)
+        box.normals = [vec3(0, 0, -1), vec3(0, 0, 1)]
+        self.assertEqual([vec3(0, 0, 1)], box.axes)
+
+    def test_rotated_axes(self):
+        box = BoundingBox()
+        box.normals = [vec3(1)]
+        self.assertEqual([vec3(1)], box.rotated_axes(identity()))
+
+        matrix = identity()
+        rotate(matrix, vec3(0, 90))
+        self.assertEqual([vec3(0, 0, -1)], box.rotated_axes(matrix))
+        self.assertIs(box.rotated_axes(matrix), box.rotated_axes(matrix))
+
+    def test_world_vertices(self):
+        box = BoundingBox()
+        box.vertices = [vec3(1), vec3(-1)]
+        self.assertEqual([vec3(1), vec3(-1)], box.world_vertices)
+
+        matrix = identity()
+        translate(matrix, vec3(0, 2))
+        box.model_matrix = matrix
+        self.assertEqual([vec3(1, 2), vec3(-1, 2)], box.world_vertices)
+        self.assertEqual(vec3(0, 2), box.world_position)
+        self.assertIs(box.world_vertices, box.world_vertices)
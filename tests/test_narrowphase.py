@@ -0,0 +1,71 @@
+import unittest
+
+from math_helper import vec3, identity, translate, rotate
+from model import BoundingBox
+from narrowphase import narrowphase, pack_pairs, split_batch, NarrowphasePool
+from systems import CollisionSystem
+
+
+class NarrowphaseTest(unittest.TestCase):
+    normals = [vec3(1), vec3(-1), vec3(0, 1), vec3(0, -1), vec3(0, 0, 1), vec3(0, 0, -1)]
+    vertices = [
+        vec3(1, 1, 1), vec3(-1, 1, 1),
+        vec3(1, -1, 1), vec3(1, 1, -1),
+        vec3(1, -1, -1), vec3(-1, 1, -1),
+        vec3(-1, -1, 1), vec3(-1, -1, -1)
+    ]
+
+    def create_box(self, position: vec3, rotation: vec3 = None):
+        box = BoundingBox()
+        box.vertices = self.vertices
+        box.normals = self.normals
+        translate(box.model_matrix, position)
+        rotation_matrix = identity()
+        if rotation is not None:
+            rotate(rotation_matrix, rotation)
+        return box, box.rotated_axes(rotation_matrix)
+
+    def create_pairs(self):
+        box, box_axes = self.create_box(vec3())
+        return [
+            (box, box_axes, *self.create_box(vec3(1.5))),
+            (box, box_axes, *self.create_box(vec3(3))),
+            (box, box_axes, *self.create_box(vec3(0, 0, -1.75), vec3(0, 45))),
+            (box, box_axes, *self.create_box(vec3(0.5, 1.5, 0))),
+        ]
+
+    def test_narrowphase(self):
+        collides, translations = narrowphase(pack_pairs(self.create_pairs()))
+        self.assertEqual([True, False, True, True], list(collides))
+        self.assertAlmostEqual(-0.5, translations[0][0])
+        self.assertAlmostEqual(0, translations[0][1])
+        self.assertAlmostEqual(-0.5, translations[3][1])
+
+    def test_split_batch(self):
+        batch = pack_pairs(self.create_pairs())
+        chunks = split_batch(batch, 3)
+        self.assertEqual([2, 1, 1], [len(chunk['axes']) for chunk in chunks])
+
+    def test_pool_matches_serial(self):
+        pairs = self.create_pairs() * 20
+        expected_collides, expected_translations = narrowphase(pack_pairs(pairs))
+
+        pool = NarrowphasePool(2, min_batch_size=1)
+        try:
+            collides, translations = pool.run(pack_pairs(pairs))
+        finally:
+            pool.shutdown()
+        self.assertEqual(list(expected_collides), list(collides))
+        self.assertEqual(expected_translations.tolist(), translations.tolist())
+
+    def test_matches_collides(self):
+        box, box_axes = self.create_box(vec3())
+        for position in [vec3(1.5), vec3(3), vec3(0.5, 1.5, 0)]:
+            other, other_axes = self.create_box(position)
+            expected, overlap = CollisionSystem.collides(box, identity(), other, identity())
+            collides, translations = narrowphase(pack_pairs([(box, box_axes, other, other_axes)]))
+            self.assertEqual(expected, collides[0])
+            if expected:
+                self.assertAlmostEqual(abs(overlap.x), abs(translations[0][0]))
+                self.assertAlmostEqual(abs(overlap.y), abs(translations[0][1]))
+                self.assertAlmostEqual(abs(overlap.z), abs(translations[0][2]))
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from math_helper import vec3
+from pool import EntityPool, ContactBuffer
+
+
+class Entity:
+    pass
+
+
+class EntityPoolTest(unittest.TestCase):
+    def test_ids_are_recycled(self):
+        pool = EntityPool()
+        first, second, third = Entity(), Entity(), Entity()
+        self.assertEqual(0, pool.acquire(first))
+        self.assertEqual(1, pool.acquire(second))
+
+        pool.release(first)
+        self.assertFalse(hasattr(first, 'entity_id'))
+        self.assertEqual(1, len(pool))
+        self.assertIsNone(pool.get(0))
+
+        self.assertEqual(0, pool.acquire(third))
+        self.assertIs(third, pool.get(0))
+        self.assertEqual(2, pool.capacity)
+
+    def test_capacity_stays_bounded(self):
+        contacts = ContactBuffer(capacity=4)
+        pool = EntityPool(contacts)
+        entities = [Entity() for _ in range(4)]
+        for entity in entities:
+            pool.acquire(entity)
+        for _ in range(100):
+            entity = entities.pop(0)
+            contacts.add(entity.entity_id, vec3(1))
+            pool.release(entity)
+            entity = Entity()
+            contacts.add(pool.acquire(entity), vec3(1))
+            entities.append(entity)
+        self.assertEqual(4, pool.capacity)
+        self.assertEqual(4, contacts.contacts.shape[0])
+
+    def test_released_ids_have_no_contacts(self):
+        contacts = ContactBuffer()
+        pool = EntityPool(contacts)
+        first = Entity()
+        entity_id = pool.acquire(first)
+        contacts.add(entity_id, vec3(1))
+        pool.release(first)
+        self.assertEqual(entity_id, pool.acquire(Entity()))
+        self.assertEqual([], contacts.get(entity_id))
+
+
+class ContactBufferTest(unittest.TestCase):
+    @staticmethod
+    def resolve(contacts: list) -> list:
+        buffer = ContactBuffer()
+        for contact in contacts:
+            buffer.add(0, contact)
+        return buffer.resolve(np.array([0]))[0].tolist()
+
+    def test_resolve(self):
+        self.assertEqual([0.5, 0, 1], self.resolve([vec3(0.5), vec3(0.25, 0, 1)]))
+
+    def test_resolve_opposite_directions(self):
+        self.assertEqual([0.25, 0, -1], self.resolve([vec3(0.5), vec3(-0.25), vec3(0, 0, -1)]))
+
+    def test_pop(self):
+        contacts = [vec3(0.5), vec3(-0.25), vec3(0, 0, -1), vec3(0.25, 0, 1)]
+        buffer = ContactBuffer(capacity=1, max_contacts=2)
+        for contact in contacts:
+            buffer.add(3, contact)
+        self.assertEqual(contacts, buffer.get(3))
+
+        correction = buffer.pop(np.array([0, 3, 10]))
+        self.assertEqual([0, 0, 0], correction[0].tolist())
+        self.assertEqual([0.25, 0, 0], correction[1].tolist())
+        self.assertEqual([0, 0, 0], correction[2].tolist())
+        self.assertEqual([], buffer.get(3))
+
+    def test_clear(self):
+        buffer = ContactBuffer()
+        buffer.add(0, vec3(1))
+        buffer.add(1, vec3(1))
+        self.assertEqual(2, len(buffer))
+        buffer.clear()
+        self.assertEqual(0, len(buffer))
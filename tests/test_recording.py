@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from game_data import GameData
+from math_helper import vec2
+from recording import InputRecorder, idle_recording, load_recording, replay
+
+
+class FakeGame:
+    def __init__(self):
+        self.frames = []
+        self.labyrinth_blocks = []
+
+    def tick(self, game_data: GameData):
+        self.frames.append((game_data.frame_time, game_data.actions, game_data.movement, game_data.mouse_movement))
+
+    def load_labyrinth_blocks(self, offsets: list):
+        self.labyrinth_blocks.append(offsets)
+
+
+class RecordingTest(unittest.TestCase):
+    path = "test_recording.json"
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_record_and_replay(self):
+        recorder = InputRecorder(seed=42, grid_collision=True)
+        game_data = GameData()
+        game_data.frame_time = 0.5
+        game_data.actions = frozenset(['move_forward', 'toggle_wireframe'])
+        game_data.triggered_actions = frozenset(['toggle_wireframe'])
+        game_data.mouse_movement = vec2(3, -1)
+        recorder.record(game_data)
+        recorder.record_labyrinth_blocks([(0, 13), (13, 0)])
+        game_data.actions = frozenset()
+        game_data.triggered_actions = frozenset()
+        game_data.frame_time = 0.25
+        recorder.record(game_data)
+        recorder.save(self.path)
+
+        recording = load_recording(self.path)
+        self.assertEqual(42, recording['seed'])
+        self.assertTrue(recording['grid_collision'])
+
+        game = FakeGame()
+        replay(game, GameData(), recording)
+        self.assertEqual([
+            (0.5, frozenset(['move_forward', 'toggle_wireframe']), vec2(0, -1), vec2(3, -1)),
+            (0.25, frozenset(), vec2(), vec2(3, -1)),
+        ], game.frames)
+        self.assertEqual([[[0, 13], [13, 0]], []], game.labyrinth_blocks)
+
+    def test_replay_without_labyrinth_blocks(self):
+        recording = {'seed': 1, 'frames': [{
+            'frame_time': 0.5, 'actions': [], 'triggered_actions': [], 'mouse_position': [0, 0],
+            'mouse_movement': [0, 0],
+        }]}
+        game = FakeGame()
+        replay(game, GameData(), recording)
+        self.assertEqual(1, len(game.frames))
+        self.assertEqual([], game.labyrinth_blocks)
+
+    def test_idle_recording(self):
+        game = FakeGame()
+        ticks = []
+        replay(game, GameData(), idle_recording(3, 0.25, seed=7), lambda: ticks.append(len(game.frames)))
+        self.assertEqual([0, 1, 2], ticks)
+        self.assertEqual([(0.25, frozenset(), vec2(), vec2())] * 3, game.frames)
@@ -0,0 +1,67 @@
+import unittest
+
+from registry import EntityRegistry
+from systems import System
+
+
+class Entity:
+    def __init__(self, systems: list, **components):
+        self.systems = systems
+        for name in components:
+            setattr(self, name, components[name])
+
+
+class EntityRegistryTest(unittest.TestCase):
+    def create_registry(self):
+        return EntityRegistry({
+            "position": System("Position", ['position'], ['velocity']),
+            "movement": System("Movement", ['position', 'velocity']),
+        })
+
+    def test_add(self):
+        registry = self.create_registry()
+        entity = Entity(['position', 'movement'], position=1)
+        registry.add(entity)
+        self.assertIn(entity, registry)
+        self.assertTrue(registry.matches('position', entity))
+        self.assertFalse(registry.matches('movement', entity))
+        self.assertFalse(registry.matches('unknown', entity))
+
+    def test_matches_only_listed_systems(self):
+        registry = self.create_registry()
+        entity = Entity(['movement'], position=1, velocity=2)
+        registry.add(entity)
+        self.assertFalse(registry.matches('position', entity))
+        self.assertTrue(registry.matches('movement', entity))
+
+    def test_shared_archetype(self):
+        registry = self.create_registry()
+        entity1 = Entity(['position'], position=1)
+        entity2 = Entity(['position'], position=2)
+        registry.add(entity1)
+        registry.add(entity2)
+        self.assertEqual(1, len(registry.archetypes))
+        self.assertEqual([entity1, entity2], registry.query('position'))
+
+    def test_add_and_remove_component(self):
+        registry = self.create_registry()
+        entity = Entity(['position', 'movement'], position=1)
+        registry.add(entity)
+
+        registry.add_component(entity, 'velocity', 3)
+        self.assertEqual(3, entity.velocity)
+        self.assertTrue(registry.matches('movement', entity))
+
+        registry.remove_component(entity, 'velocity')
+        self.assertFalse(hasattr(entity, 'velocity'))
+        self.assertFalse(registry.matches('movement', entity))
+        self.assertTrue(registry.matches('position', entity))
+
+    def test_remove(self):
+        registry = self.create_registry()
+        entity = Entity(['position'], position=1)
+        registry.add(entity)
+        registry.remove(entity)
+        self.assertNotIn(entity, registry)
+        self.assertEqual([], registry.query('position'))
+        self.assertEqual(0, len(registry))
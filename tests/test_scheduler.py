@@ -0,0 +1,115 @@
+import threading
+import unittest
+
+from jobs import JobSystem
+from registry import EntityRegistry
+from scheduler import Scheduler
+from systems import System
+
+
+class RecordingSystem(System):
+    def __init__(self, name, calls: list, components: list, reads: list = None, writes: list = None):
+        super().__init__(name, components, reads=reads, writes=writes)
+        self.calls = calls
+        self.threads = set()
+
+    def run(self, game_data, entity):
+        self.threads.add(threading.current_thread())
+        self.calls.append((self.name, entity.name))
+
+
+class BatchedSystem(RecordingSystem):
+    batched = True
+
+
+class MainThreadSystem(RecordingSystem):
+    main_thread = True
+
+
+class Entity:
+    def __init__(self, name: str, systems: list):
+        self.name = name
+        self.systems = systems
+        self.position = 0
+        self.velocity = 0
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.systems = {
+            "movement": BatchedSystem("movement", self.calls, ['velocity'], writes=['velocity']),
+            "position": RecordingSystem("position", self.calls, ['position'], reads=['position', 'velocity'],
+                                        writes=['position']),
+            "render": RecordingSystem("render", self.calls, ['position']),
+        }
+        self.registry = EntityRegistry(self.systems)
+
+    def test_runs_in_global_order(self):
+        scheduler = Scheduler(self.systems, self.registry, ["movement", "position", "render"])
+        entity1 = Entity("e1", ['render', 'position'])
+        entity2 = Entity("e2", ['position', 'movement'])
+        self.registry.add(entity1)
+        self.registry.add(entity2)
+
+        scheduler.run(None, [entity1, entity2, entity1])
+        self.assertEqual([
+            ("movement", "e2"),
+            ("position", "e1"),
+            ("position", "e2"),
+            ("render", "e1"),
+        ], self.calls)
+
+    def test_runs_precomputed_entities(self):
+        scheduler = Scheduler(self.systems, self.registry, ["movement", "position", "render"])
+        entity = Entity("e1", ['movement', 'render'])
+        del entity.velocity
+        hidden = Entity("e2", ['render'])
+        self.registry.add(entity)
+        self.registry.add(hidden)
+
+        scheduler.run(None, [entity])
+        # components that are not added through the registry are not picked up
+        entity.velocity = 0
+        scheduler.run(None, [entity])
+        self.registry.remove_component(entity, 'velocity')
+        self.registry.add_component(entity, 'velocity', 0)
+        scheduler.run(None, [entity])
+        self.assertEqual([
+            ("render", "e1"),
+            ("render", "e1"),
+            ("movement", "e1"),
+            ("render", "e1"),
+        ], self.calls)
+
+    def test_unknown_system(self):
+        with self.assertRaises(KeyError):
+            Scheduler(self.systems, self.registry, ["movement", "unknown"])
+
+    def test_dependencies(self):
+        scheduler = Scheduler(self.systems, self.registry, ["movement", "position", "render"])
+        self.assertEqual({
+            "movement": [],
+            "position": ["movement"],
+            "render": ["position"],
+        }, scheduler.dependencies())
+
+    def test_runs_on_jobs_in_dependency_order(self):
+        self.systems["render"] = MainThreadSystem("render", self.calls, ['position'])
+        self.systems["sound"] = RecordingSystem("sound", self.calls, ['velocity'])
+        registry = EntityRegistry(self.systems)
+        jobs = JobSystem(2)
+        scheduler = Scheduler(self.systems, registry, ["movement", "position", "sound", "render"], jobs)
+        entity = Entity("e1", ['movement', 'position', 'sound', 'render'])
+        registry.add(entity)
+
+        scheduler.run(None, [entity])
+        jobs.shutdown()
+
+        self.assertEqual(4, len(self.calls))
+        self.assertLess(self.calls.index(("movement", "e1")), self.calls.index(("position", "e1")))
+        self.assertLess(self.calls.index(("movement", "e1")), self.calls.index(("sound", "e1")))
+        self.assertLess(self.calls.index(("position", "e1")), self.calls.index(("render", "e1")))
+        self.assertEqual({threading.main_thread()}, self.systems["render"].threads)
+        self.assertEqual({threading.main_thread()}, self.systems["sound"].threads)
+        self.assertNotIn(threading.main_thread(), self.systems["movement"].threads)
@@ -1,8 +1,12 @@
 import unittest
 
+from cube import cube
+from game_data import GameData
 from math_helper import vec3, identity, translate, mat4
 from model import BoundingBox
-from systems import CollisionSystem
+from pool import EntityPool, ContactBuffer
+from quad_tree import build_quad_tree
+from systems import CollisionSystem, InterpolationSystem, PositionSystem
 
 
 class CollisionTest(unittest.TestCase):
@@ -50,6 +54,33 @@ class CollisionTest(unittest.TestCase):
         collides = CollisionSystem.collides(box, matrix, other, matrix)
         self.assertTrue(collides)
 
+    @staticmethod
+    def collide_cubes(workers: int) -> list:
+        entities = [cube(1, vec3(10 + i * 1.5, 0, 10 + i * 0.5), vec3(1, 0, 1), render=False) for i in range(4)]
+        pool = EntityPool()
+        for entity in entities:
+            pool.acquire(entity)
+            entity.bounding_boxes[0].type = 'dynamic'
+
+        game_data = GameData()
+        PositionSystem().run_all(game_data, entities)
+        game_data.entities = build_quad_tree(entities)
+        game_data.contacts = ContactBuffer()
+
+        system = CollisionSystem(workers)
+        if system.pool is not None:
+            system.pool.min_batch_size = 1
+        try:
+            system.run_all(game_data, entities)
+        finally:
+            system.shutdown()
+        return [[contact.to_list() for contact in game_data.contacts.get(entity.entity_id)] for entity in entities]
+
+    def test_batched_collision_matches_serial(self):
+        expected = self.collide_cubes(0)
+        self.assertGreater(sum(map(len, expected)), 0)
+        self.assertEqual(expected, self.collide_cubes(2))
+
     @unittest.skip("Fix this")
     def test_not_collides_simple_position(self):
         box = BoundingBox()
@@ -119,3 +150,53 @@ class CollisionTest(unittest.TestCase):
 
         collides = CollisionSystem.collides(box, box_model_matrix, other, other_model_matrix)
         self.assertFalse(collides)
+
+
+class InterpolationTest(unittest.TestCase):
+    class Entity:
+        position = vec3(2, 0, 4)
+
+    class Data:
+        interpolation = 0.25
+
+    def test_interpolated_position(self):
+        entity = self.Entity()
+        entity.previous_position = vec3(1, 0, 0)
+        self.assertEqual(vec3(1.25, 0, 1), InterpolationSystem.interpolated_position(self.Data(), entity))
+
+    def test_interpolated_position_without_previous_position(self):
+        entity = self.Entity()
+        self.assertEqual(vec3(2, 0, 4), InterpolationSystem.interpolated_position(self.Data(), entity))
+
+
+class PositionTest(unittest.TestCase):
+    class Entity:
+        def __init__(self):
+            self.position = vec3(1, 2, 3)
+            self.rotation = vec3(0, 90, 0)
+            self.scale = 2
+            self.bounding_boxes = [BoundingBox()]
+
+    def test_transform_key(self):
+        entity = self.Entity()
+        key = PositionSystem.get_transform_key(entity)
+        self.assertEqual((1, 2, 3, 0, 90, 0, 2), key)
+
+        entity.rotation.y += 1
+        self.assertNotEqual(key, PositionSystem.get_transform_key(entity))
+
+    def test_model_matrix_only_updated_on_change(self):
+        system = PositionSystem()
+        entity = self.Entity()
+        system.run(None, entity)
+        model_matrix = entity.model_matrix
+        box_matrix = entity.bounding_boxes[0].model_matrix
+
+        system.run(None, entity)
+        self.assertIs(model_matrix, entity.model_matrix)
+        self.assertIs(box_matrix, entity.bounding_boxes[0].model_matrix)
+
+        entity.position = vec3(1, 2, 4)
+        system.run(None, entity)
+        self.assertIsNot(model_matrix, entity.model_matrix)
+        self.assertEqual(vec3(1, 2, 4), entity.model_matrix * vec3())
@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+import unittest
+
+from tracing import Tracer
+
+
+class TracerTest(unittest.TestCase):
+    path = "test_trace.json"
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def exported_phases(self) -> list:
+        with open(self.path) as f:
+            return [event['ph'] for event in json.load(f)['traceEvents']]
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(capacity=4)
+        with tracer.span("Frame"):
+            tracer.counter("Entities", 3)
+        self.assertEqual([], tracer.events())
+
+    def test_spans_and_counters(self):
+        tracer = Tracer(capacity=8)
+        tracer.start()
+        with tracer.span("Frame"):
+            tracer.counter("Entities", 3)
+        events = tracer.events()
+
+        self.assertEqual(['B', 'C', 'E'], [event['ph'] for event in events])
+        self.assertEqual(['Frame', 'Entities', 'Frame'], [event['name'] for event in events])
+        self.assertEqual({'Entities': 3.0}, events[1]['args'])
+        self.assertEqual(threading.get_ident(), events[0]['tid'])
+        self.assertLessEqual(events[0]['ts'], events[2]['ts'])
+
+    def test_ring_buffer_keeps_newest_events(self):
+        tracer = Tracer(capacity=4)
+        tracer.start()
+        for value in range(10):
+            tracer.counter("Value", value)
+        values = [event['args']['Value'] for event in tracer.events()]
+        self.assertEqual([6.0, 7.0, 8.0, 9.0], values)
+
+    def test_export_twice(self):
+        tracer = Tracer(capacity=8)
+        tracer.start(self.path)
+        with tracer.span("Frame"):
+            pass
+        tracer.export()
+        self.assertEqual(['B', 'E'], self.exported_phases())
+        tracer.counter("Entities", 3)
+        tracer.export()
+        self.assertEqual(['B', 'E', 'C'], self.exported_phases())